@@ -2,6 +2,8 @@
 
 from machine import Pin
 import utime
+import micropython
+from micropython import const
 hb_state = True
 wdt = None
 factory_reset_exit_requested = False
@@ -13,14 +15,20 @@ BUZ.init(Pin.OUT, value=1)  # Active-low: 1 = OFF
 import gc
 import network
 import uasyncio as asyncio
+import select
+import usocket
 
 gc.collect()
 
 # ---------- Config ----------
 import config
 
+# All settings are read once, here, into module globals; one dict .get each
+# instead of a getattr per name
+_cfg_get = config.__dict__.get
+
 def cfg(name, default):
-    return getattr(config, name, default)
+    return _cfg_get(name, default)
 
 WIFI_SSID     = cfg("WIFI_SSID", "")
 WIFI_PASSWORD = cfg("WIFI_PASSWORD", "")
@@ -28,10 +36,21 @@ NS_URL        = cfg("NS_URL", "")
 NS_TOKEN      = cfg("API_SECRET", "")
 API_ENDPOINT  = cfg("API_ENDPOINT", "/api/v1/entries/sgv.json?count=2")
 DISPLAY_UNITS = cfg("UNITS", "mmol")
+_IS_MGDL      = str(DISPLAY_UNITS).lower() == "mgdl"
 DATA_SOURCE    = cfg("DATA_SOURCE", "nightscout")   # "nightscout" or "dexcom_share"
 DEXCOM_USERNAME = cfg("DEXCOM_USERNAME", "")
 DEXCOM_PASSWORD = cfg("DEXCOM_PASSWORD", "")
 DEXCOM_REGION   = cfg("DEXCOM_REGION", "us")        # "us" or "ous" (outside US)
+DEXCOM_HOST     = "shareous1.dexcom.com" if str(DEXCOM_REGION).lower() == "ous" else "share2.dexcom.com"
+
+# Optional static addressing (skips DHCP on every (re)connect); all four needed
+STATIC_IP   = cfg("STATIC_IP", "")
+STATIC_MASK = cfg("STATIC_MASK", "255.255.255.0")
+STATIC_GW   = cfg("STATIC_GW", "")
+STATIC_DNS  = cfg("STATIC_DNS", "")
+
+# Dexcom request/login tracing on the serial console; off in normal use
+DEBUG_NET = cfg("DEBUG_NET", False)
 
 
 LOW_THRESHOLD  = float(cfg("THRESHOLD_LOW", 4.0))
@@ -41,7 +60,7 @@ STALE_MIN      = int(cfg("STALE_MINS", 7))
 ALERT_DOUBLE_UP   = cfg("ALERT_DOUBLE_UP", True)
 ALERT_DOUBLE_DOWN = cfg("ALERT_DOUBLE_DOWN", True)
 
-UNIX_2000_OFFSET = 946684800
+UNIX_2000_OFFSET = const(946684800)
 last = None          # replaces main() local "last"
 
 
@@ -62,15 +81,19 @@ import large_font
 # Memory monitoring removed - not needed with 8MB RAM
     
 # ---------- Colors ----------
-YELLOW = 0xFFE0
-RED    = 0xF800
-GREEN  = 0x07E0
-BLACK  = 0x0000
-WHITE  = 0xFFFF
+YELLOW = const(0xFFE0)
+RED    = const(0xF800)
+GREEN  = const(0x07E0)
+BLACK  = const(0x0000)
+WHITE  = const(0xFFFF)
 
-# IMPORTANT: you need sta defined before connect_wifi() uses it
+# IMPORTANT: you need sta defined before connect_wifi_async() uses it
 sta = None
 
+# The STA interface object; WLAN() hands back the same interface every time,
+# so build it once instead of on every connectivity check
+_STA = network.WLAN(network.STA_IF)
+
 # Memory monitoring removed - not needed with 8MB RAM
 
 BTN_STOP = Pin(2, Pin.IN, Pin.PULL_UP)
@@ -102,32 +125,11 @@ def request_buzzer_stop():
 # FACTORY_BTN = Pin(16, Pin.IN, Pin.PULL_UP)
 
 
-# --- Logo Config ---
-LOGO_FILE = "logo.bin"
-LOGO_W = 320
-LOGO_H = 240
-
-def show_logo(lcd):
-    expected = LOGO_W * LOGO_H * 2  # 307200
-    try:
-        import os
-        st = os.stat(LOGO_FILE)
-        if st[6] == expected:
-            with open(LOGO_FILE, "rb") as f:
-                f.readinto(lcd.buffer)
-            lcd.show()
-            return True
-    except:
-        pass
-    return False
-
-
 # ---------- Helpers ----------
 
 def _show_rect(lcd, x, y, w, h):
-    global _DIRTY
     if _BATCHING:
-        _DIRTY = _union_rect(_DIRTY, (x, y, w, h))
+        _add_dirty((x, y, w, h))
         return
 
     if hasattr(lcd, "show_rect"):
@@ -142,35 +144,45 @@ wifi_ok = False
 
 # ---------- Batched screen flush ----------
 _BATCHING = False
-_DIRTY = None  # (x, y, w, h)
+_DIRTY = []  # [(x, y, w, h), ...]; overlapping rects are merged on insert
+
+def _add_dirty(r):
+    # Fields sit in separate bands (age/heart, BG, arrow/delta), so keep them
+    # as separate rects; a single union would span most of the screen.
+    x, y, w, h = r
+    for i in range(len(_DIRTY)):
+        ox, oy, ow, oh = _DIRTY[i]
+        if x < ox + ow and ox < x + w and y < oy + oh and oy < y + h:
+            del _DIRTY[i]
+            _add_dirty(_union_rect((ox, oy, ow, oh), r))
+            return
+    _DIRTY.append(r)
 
 def _begin_batch():
-    global _BATCHING, _DIRTY
+    global _BATCHING
     _BATCHING = True
-    _DIRTY = None
+    _DIRTY.clear()
 
 def _end_batch(lcd):
-    global _BATCHING, _DIRTY
+    global _BATCHING
     _BATCHING = False
     if not _DIRTY:
         return
-    x, y, w, h = _DIRTY
-    if hasattr(lcd, "show_rect"):
-        lcd.show_rect(x, y, w, h)
-    else:
+    area = 0
+    for r in _DIRTY:
+        area += r[2] * r[3]
+    # Several windows cost a command burst each; past ~half the panel one
+    # full-frame push is cheaper
+    if area * 2 > lcd.width * lcd.height or not hasattr(lcd, "show_rect"):
         lcd.show()
-    _DIRTY = None
-
+    else:
+        for x, y, w, h in _DIRTY:
+            lcd.show_rect(x, y, w, h)
+    _DIRTY.clear()
 
-def connect_wifi(ssid, password, max_attempts=2):
-    import utime
-    import network
 
-    global sta, wdt
-
-    # Feed before starting
-    if wdt:
-        wdt.feed()
+def _sta_up():
+    global sta
 
     # Hard reset the STA interface to avoid EPERM
     if sta is not None:
@@ -180,12 +192,34 @@ def connect_wifi(ssid, password, max_attempts=2):
         except Exception:
             pass
 
-    sta = network.WLAN(network.STA_IF)
+    sta = _STA
     sta.active(True)
     utime.sleep_ms(200)
-    
+
+    # Keep the radio awake: modem power-save adds latency to every poll
+    try:
+        sta.config(pm=sta.PM_NONE)
+    except Exception:
+        pass
+
+    if STATIC_IP and STATIC_GW:
+        try:
+            sta.ifconfig((STATIC_IP, STATIC_MASK, STATIC_GW, STATIC_DNS or STATIC_GW))
+        except Exception:
+            pass
+
     if wdt:
         wdt.feed()
+    return sta
+
+
+async def connect_wifi_async(ssid, password, max_attempts=2):
+    # Waits on the scheduler so the heartbeat, buttons and alert buzzer keep
+    # running while the radio associates; boot runs it via asyncio.run()
+    if wdt:
+        wdt.feed()
+
+    sta = _sta_up()
 
     for attempt in range(1, max_attempts + 1):
         try:
@@ -193,23 +227,14 @@ def connect_wifi(ssid, password, max_attempts=2):
                 return True
 
             sta.connect(ssid, password)
-            
-            if wdt:
-                wdt.feed()
 
-            start = utime.ticks_ms()
+            deadline = utime.ticks_add(utime.ticks_ms(), 50000)
             while not sta.isconnected():
-                status = sta.status()
-                elapsed = utime.ticks_diff(utime.ticks_ms(), start)
-
-                # Feed watchdog every second during connection
-                if elapsed % 1000 < 100 and wdt:
+                if wdt:
                     wdt.feed()
-
-                if elapsed > 50000:
+                if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
                     break
-
-                utime.sleep_ms(1000)
+                await asyncio.sleep_ms(250)
 
             if sta.isconnected():
                 return True
@@ -221,11 +246,11 @@ def connect_wifi(ssid, password, max_attempts=2):
             sta.disconnect()
         except Exception:
             pass
-        
+
         if wdt:
             wdt.feed()
-        
-        utime.sleep_ms(800)
+
+        await asyncio.sleep_ms(800)
 
     return False
 
@@ -235,16 +260,52 @@ def now_unix_s():
     t = utime.time()
     return t + UNIX_2000_OFFSET if t < 1200000000 else t
 
+# Last NTP server address that worked, kept across reboots to skip DNS
+NTP_IP_FILE = "ntp_ip.txt"
+NTP_HOST = "pool.ntp.org"
+# RTC re-sync period once synced (see task_ntp_resync)
+NTP_RESYNC_MS = const(6 * 60 * 60 * 1000)
+ntp_ok = False
+
 def ntp_sync():
+    # One attempt against the cached address, then one via DNS; no retry
+    # loop here - the caller carries on with the RTC as it is on failure
+    import ntptime
     try:
-        import ntptime
-        before = now_unix_s()
-        ntptime.settime()
-        after = now_unix_s()
-        drift = after - before
+        try:
+            with open(NTP_IP_FILE) as f:
+                cached = f.read().strip()
+        except OSError:
+            cached = ""
+
+        if cached:
+            ntptime.host = cached
+            try:
+                ntptime.settime()
+                return True
+            except Exception:
+                pass  # pool address may have rotated out; resolve afresh
+
+        try:
+            ip = usocket.getaddrinfo(NTP_HOST, 123)[0][-1][0]
+            if not isinstance(ip, str):
+                ip = NTP_HOST
+            ntptime.host = ip
+            ntptime.settime()
+        except Exception:
+            return False
+
+        if ip != cached and ip != NTP_HOST:
+            try:
+                with open(NTP_IP_FILE, "w") as f:
+                    f.write(ip)
+            except OSError:
+                pass
         return True
-    except Exception as e:
-        return False
+    finally:
+        # Only needed for a moment; don't keep it resident
+        import sys
+        sys.modules.pop("ntptime", None)
 
 
 def ensure_count2(endpoint: str) -> str:
@@ -257,115 +318,222 @@ def ensure_count2(endpoint: str) -> str:
     return endpoint + joiner + "count=2"
 
 
-def fetch_ns_text():
-    import usocket
-    import network
-    import utime
-    import ssl
+def _parse_url(u):
+    # Returns (scheme, host, port, path)
+    if u.startswith("http://"):
+        scheme = "http"
+        rest = u[7:]
+        default_port = 80
+    elif u.startswith("https://"):
+        scheme = "https"
+        rest = u[8:]
+        default_port = 443
+    else:
+        raise ValueError("URL must start with http:// or https://")
 
-    global wdt
-    gc.collect()
-    
+    # split host[:port] and /path
+    if "/" in rest:
+        hostport, path = rest.split("/", 1)
+        path = "/" + path
+    else:
+        hostport = rest
+        path = "/"
+
+    if ":" in hostport:
+        host, port_s = hostport.split(":", 1)
+        port = int(port_s)
+    else:
+        host = hostport
+        port = default_port
+
+    return scheme, host, port, path
+
+
+def _build_ns_request(host, path):
+    headers = [
+        "GET {} HTTP/1.1".format(path),
+        "Host: {}".format(host),
+        "Accept: application/json",
+        "Connection: keep-alive",
+    ]
+    if NS_TOKEN:
+        headers.append("api-secret: {}".format(NS_TOKEN))
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8")
+
+
+def _ns_target(u):
+    # (scheme, host, port, path, request_bytes) for a Nightscout URL
+    scheme, host, port, path = _parse_url(u)
+    return scheme, host, port, path, _build_ns_request(host, path)
+
+
+# Parsed URL + encoded request for the configured endpoint; built on first fetch
+_NS_TARGET = None
+
+# Resolved addresses, keyed by (host, port); dropped again if a connect fails
+_ADDR_CACHE = {}
+
+# Kept-alive connection to the Nightscout server, keyed by (scheme, host, port)
+_NS_CONN_KEY = None
+_NS_SOCK = None
+
+
+def _ns_close():
+    global _NS_SOCK, _NS_CONN_KEY
+    try:
+        if _NS_SOCK:
+            _NS_SOCK.close()
+    except:
+        pass
+    _NS_SOCK = None
+    _NS_CONN_KEY = None
+
+
+def _ns_connect(scheme, host, port):
     if wdt:
-        wdt.feed()  # Feed before network operations
-    
-    # Must have WiFi before DNS/getaddrinfo, or it can block forever
+        wdt.feed()  # Feed before DNS lookup
+    gc.collect()
+
+    hp = (host, port)
+    addr = _ADDR_CACHE.get(hp)
+    if addr is None:
+        addr = _ADDR_CACHE[hp] = usocket.getaddrinfo(host, port)[0][-1]
+    s = usocket.socket()
+    s.settimeout(2)
     try:
-        wlan = network.WLAN(network.STA_IF)
-        if not wlan.active() or not wlan.isconnected():
-            return None
-    except Exception as e:
-        return None
+        s.connect(addr)
+        # TLS if https
+        if scheme == "https":
+            import ssl
+            s = ssl.wrap_socket(s, server_hostname=host)
+    except:
+        s.close()
+        _ADDR_CACHE.pop(hp, None)  # server may have moved; resolve again next time
+        raise
 
-    if not NS_URL:
-        return None
+    if wdt:
+        wdt.feed()  # Feed after connection established
+    return s
 
-    # Build URL (may be http or https depending on NS_URL)
-    url = NS_URL + ensure_count2(API_ENDPOINT)
 
-    MIN_FREE = 20000 # Reduced slightly to be less aggressive
-    free = gc.mem_free()
-    if free < MIN_FREE:
-        return None
-    
+_NS_POLL = select.poll()
+NS_WAIT_MS = 2000  # server response budget, same as the socket timeout
 
-    def _parse_url(u):
-        # Returns (scheme, host, port, path)
-        if u.startswith("http://"):
-            scheme = "http"
-            rest = u[7:]
-            default_port = 80
-        elif u.startswith("https://"):
-            scheme = "https"
-            rest = u[8:]
-            default_port = 443
-        else:
-            raise ValueError("URL must start with http:// or https://")
 
-        # split host[:port] and /path
-        if "/" in rest:
-            hostport, path = rest.split("/", 1)
-            path = "/" + path
-        else:
-            hostport = rest
-            path = "/"
+async def _ns_readable(s):
+    # Wait for the response on the scheduler rather than inside recv(), so
+    # the heartbeat and buzzer keep running while the server answers
+    p = _NS_POLL
+    p.register(s, select.POLLIN)
+    try:
+        deadline = utime.ticks_add(utime.ticks_ms(), NS_WAIT_MS)
+        while not p.poll(0):
+            if utime.ticks_diff(deadline, utime.ticks_ms()) <= 0:
+                return False
+            await asyncio.sleep_ms(20)
+        return True
+    finally:
+        p.unregister(s)
 
-        if ":" in hostport:
-            host, port_s = hostport.split(":", 1)
-            port = int(port_s)
-        else:
-            host = hostport
-            port = default_port
 
-        return scheme, host, port, path
+async def _ns_send(target):
+    # Send the request on the kept-alive socket (opening one if needed) and
+    # return the first chunk of the response. A server-side close only shows
+    # up on send/recv, so a reused socket gets one retry on a fresh one.
+    global _NS_SOCK, _NS_CONN_KEY
 
-    def _one_request(u, max_body=2048):
-        scheme, host, port, path = _parse_url(u)
+    scheme, host, port, path, req = target
+    key = (scheme, host, port)
 
-        s = None
+    if _NS_SOCK is not None and _NS_CONN_KEY == key:
         try:
-            if wdt:
-                wdt.feed()  # Feed before DNS lookup
-            gc.collect()
+            _NS_SOCK.send(req)
+            if await _ns_readable(_NS_SOCK):
+                first = _NS_SOCK.recv(256)
+                if first:
+                    return first
+        except OSError:
+            pass
 
-            addr = usocket.getaddrinfo(host, port)[0][-1]
-            s = usocket.socket()
-            s.settimeout(2)
-            s.connect(addr)
+    _ns_close()
+    _NS_SOCK = _ns_connect(scheme, host, port)
+    _NS_CONN_KEY = key
+    _NS_SOCK.send(req)
+    if not await _ns_readable(_NS_SOCK):
+        raise OSError(110)  # ETIMEDOUT
+    return _NS_SOCK.recv(256)
+
+
+# Fixed receive buffer (header + body cap); responses are read straight into
+# it instead of growing a bytearray and copying it to bytes afterwards
+_NS_RX = bytearray(2048 + 512)
+_NS_RXV = memoryview(_NS_RX)
 
-            # TLS if https
-            if scheme == "https":
-                try:
-                    import ssl
-                    s = ssl.wrap_socket(s, server_hostname=host)
-                except Exception as e:
-                    try:
-                        s.close()
-                    except:
-                        pass
-                    return None, None, None
 
+async def _ns_one_request(target, max_body=2048):
+    rx = _NS_RX
+    rxv = _NS_RXV
+    n = 0
+    sep = -1
+    keep = False
+    try:
+        first = await _ns_send(target)
+        if not first:
+            return None, None, None
+        s = _NS_SOCK
+
+        # Read response with a cap (avoid ENOMEM)
+        CAP = max_body + 512  # header + body cap
+        if CAP > len(rx):
+            CAP = len(rx)
+        t_recv0 = utime.ticks_ms()
+        RECV_BUDGET_MS = 1200
+
+        # Headers arrive in small recv() chunks until the blank line is seen
+        chunk = first
+        while True:
+            take = len(chunk)
+            if n + take > CAP:
+                take = CAP - n
+            rxv[n:n + take] = chunk[:take]
+            n += take
+            sep = bytes(rxv[:n]).find(b"\r\n\r\n")
+            if sep >= 0 or n >= CAP:
+                break
             if wdt:
-                wdt.feed()  # Feed after connection established
-
-            headers = [
-                "GET {} HTTP/1.1".format(path),
-                "Host: {}".format(host),
-                "Accept: application/json",
-                "Connection: close",
-            ]
-            if NS_TOKEN:
-                headers.append("api-secret: {}".format(NS_TOKEN))
-            req = "\r\n".join(headers) + "\r\n\r\n"
-            s.send(req.encode("utf-8"))
-
-            # Read response with a cap (avoid ENOMEM)
-            buf = bytearray()
-            CAP = max_body + 512  # header + body cap
-            t_recv0 = utime.ticks_ms()
-            RECV_BUDGET_MS = 1200
-
-            while True:
+                wdt.feed()
+            if utime.ticks_diff(utime.ticks_ms(), t_recv0) > RECV_BUDGET_MS:
+                break
+            chunk = s.recv(256)
+            if not chunk:
+                break
+
+        if sep < 0:
+            return None, None, None
+
+        head_l = bytes(rxv[:sep]).lower()
+        want = -1  # header + body length
+        i = head_l.find(b"\r\ncontent-length:")
+        if i >= 0:
+            j = head_l.find(b"\r\n", i + 2)
+            want = sep + 4 + int(head_l[i + 17:j if j >= 0 else sep])
+
+        if 0 <= want <= CAP:
+            # Length known and it fits: read exactly the rest of the body in
+            # place, which also leaves the socket positioned for reuse
+            while n < want:
+                if wdt:
+                    wdt.feed()
+                r = s.readinto(rxv[n:want])
+                if not r:
+                    # Closed early: the rest of rx still holds an old response
+                    return None, None, None
+                n += r
+            n = want
+            keep = head_l.find(b"connection: close") < 0
+        else:
+            # Unknown or oversized body: read what fits until EOF/budget
+            while n < CAP:
                 if wdt:
                     wdt.feed()
                 if utime.ticks_diff(utime.ticks_ms(), t_recv0) > RECV_BUDGET_MS:
@@ -373,47 +541,39 @@ def fetch_ns_text():
                 chunk = s.recv(256)
                 if not chunk:
                     break
-                if (len(buf) + len(chunk)) > CAP:
-                    # append only what fits, then stop
-                    take = CAP - len(buf)
-                    if take > 0:
-                        buf.extend(chunk[:take])
-                    break
-                buf.extend(chunk)
+                take = len(chunk)
+                if n + take > CAP:
+                    take = CAP - n
+                rxv[n:n + take] = chunk[:take]
+                n += take
 
 
-        except Exception as e:
-            pass
-            return None, None, None
-
-        finally:
-            try:
-                if s:
-                    s.close()
-            except:
-                pass
-
-        # Parse status line + headers/body split
-        raw = bytes(buf)
-        sep = raw.find(b"\r\n\r\n")
-        if sep == -1:
-            return None, None, None
+    except Exception as e:
+        keep = False
+        return None, None, None
 
-        head = raw[:sep].decode("utf-8", "ignore")
-        body = raw[sep + 4 : sep + 4 + max_body]
+    finally:
+        # Only a fully read, length-delimited response leaves the socket usable
+        if not keep:
+            _ns_close()
 
-        # status code
-        status = None
-        try:
-            status_line = head.split("\r\n", 1)[0]
-            parts = status_line.split(" ")
-            if len(parts) >= 2:
-                status = int(parts[1])
-        except Exception as e:
-            pass
+    # Status code straight from the status line bytes ("HTTP/1.1 200 OK")
+    status = None
+    try:
+        sp = bytes(rxv[:16]).find(b" ")
+        if sp > 0:
+            status = int(bytes(rxv[sp + 1:sp + 4]))
+    except Exception as e:
+        pass
 
-        # headers dict (lowercased keys)
-        hdrs = {}
+    # Headers are only decoded to follow a redirect; a 200 just needs the body
+    hdrs = {}
+    body = None
+    if status == 200:
+        end = sep + 4 + max_body
+        body = bytes(rxv[sep + 4:n if n < end else end])
+    elif status in (301, 302, 303, 307, 308):
+        head = bytes(rxv[:sep]).decode("utf-8", "ignore")
         try:
             for line in head.split("\r\n")[1:]:
                 if ":" in line:
@@ -422,11 +582,38 @@ def fetch_ns_text():
         except:
             pass
 
-        return status, hdrs, body
+    return status, hdrs, body
+
+
+async def fetch_ns_body():
+    global wdt, _NS_TARGET
+    gc.collect()
+    
+    if wdt:
+        wdt.feed()  # Feed before network operations
+    
+    # Must have WiFi before DNS/getaddrinfo, or it can block forever
+    try:
+        if not _STA.active() or not _STA.isconnected():
+            return None
+    except Exception as e:
+        return None
+
+    if not NS_URL:
+        return None
+
+    MIN_FREE = 20000 # Reduced slightly to be less aggressive
+    free = gc.mem_free()
+    if free < MIN_FREE:
+        return None
 
     try:
+        # Build URL once (may be http or https depending on NS_URL)
+        if _NS_TARGET is None:
+            _NS_TARGET = _ns_target(NS_URL + ensure_count2(API_ENDPOINT))
+
         # 1) first request (may redirect)
-        status, hdrs, body = _one_request(url, max_body=2048)
+        status, hdrs, body = await _ns_one_request(_NS_TARGET, max_body=2048)
         if status is None:
             return None
 
@@ -435,7 +622,7 @@ def fetch_ns_text():
             loc = (hdrs or {}).get("location")
             if not loc:
                 return None
-            status, hdrs, body = _one_request(loc, max_body=2048)
+            status, hdrs, body = await _ns_one_request(_ns_target(loc), max_body=2048)
             if status is None:
                 return None
 
@@ -445,33 +632,46 @@ def fetch_ns_text():
         if not body:
             return None
 
-        return body.decode("utf-8", "ignore")
+        # Raw bytes: parse_ns_entries scans them without decoding
+        return body
 
-    finally:
-        gc.collect()
+    except Exception as e:
+        return None
 
 
 
 def mgdl_to_units(val_mgdl: float) -> float:
     try:
-        if str(DISPLAY_UNITS).lower() == "mgdl":
-            return float(val_mgdl)
-        return round(float(val_mgdl) / 18.0, 1)
+        if _IS_MGDL:
+            return int(val_mgdl)  # stay integer; no float work on the mg/dL path
+        # Nearest tenth of mmol/L (= round(v / 18, 1)) in integer maths; the
+        # only float made is the result
+        return ((int(val_mgdl) * 20 + 18) // 36) / 10
     except:
         return 0.0
 
+# Trend direction -> glyphs in arrows_font
+_DIR_ARROW = {
+    "Flat": "J",
+    "SingleUp": "O",
+    "DoubleUp": "OO",
+    "SingleDown": "P",
+    "DoubleDown": "PP",
+    "FortyFiveUp": "L",
+    "FortyFiveDown": "N",
+    "NOT COMPUTABLE": "--",
+    "NONE": "--",
+}
+_dir_get = _DIR_ARROW.get
+
+# Numeric trend (Dexcom Share "Trend", Nightscout "trend") -> direction name
+_TREND_DIR = {
+    1: "DoubleUp", 2: "SingleUp", 3: "FortyFiveUp", 4: "Flat",
+    5: "FortyFiveDown", 6: "SingleDown", 7: "DoubleDown",
+}
+
 def direction_to_arrow(direction: str) -> str:
-    return {
-        "Flat": "J",
-        "SingleUp": "O",
-        "DoubleUp": "OO",
-        "SingleDown": "P",
-        "DoubleDown": "PP",
-        "FortyFiveUp": "L",
-        "FortyFiveDown": "N",
-        "NOT COMPUTABLE": "--",
-        "NONE": "--",
-    }.get(direction or "NONE", "")
+    return _dir_get(direction or "NONE", "")
 
 def _find_int_after(s, key, start=0):
     i = s.find(key, start)
@@ -522,16 +722,12 @@ def _find_str_after(s, key, start=0):
 # Dexcom Share API
 # ---------------------------------------------------------------------------
 _DEXCOM_APP_ID   = "d8665ade-9673-4e27-9ff6-92db4ce13d13"
-_DEXCOM_TREND_MAP = {
-    1: "DoubleUp", 2: "SingleUp", 3: "FortyFiveUp", 4: "Flat",
-    5: "FortyFiveDown", 6: "SingleDown", 7: "DoubleDown",
-}
 _dexcom_session = None  # cached session GUID
 
 
 def _dexcom_post(host, path, json_body=""):
     """HTTPS POST to Dexcom Share host. Returns (status, body_str) or (None, None)."""
-    import usocket, ssl, utime
+    import ssl
 
     body_bytes = json_body.encode("utf-8") if json_body else b""
     req = (
@@ -548,8 +744,12 @@ def _dexcom_post(host, path, json_body=""):
     try:
         if wdt:
             wdt.feed()
-        print("[Dexcom] POST", host, path[:50])
-        addr = usocket.getaddrinfo(host, 443)[0][-1]
+        if DEBUG_NET:
+            print("[Dexcom] POST", host, path[:50])
+        hp = (host, 443)
+        addr = _ADDR_CACHE.get(hp)
+        if addr is None:
+            addr = _ADDR_CACHE[hp] = usocket.getaddrinfo(host, 443)[0][-1]
         s = usocket.socket()
         s.settimeout(10)
         s.connect(addr)
@@ -576,7 +776,8 @@ def _dexcom_post(host, path, json_body=""):
         raw = bytes(buf)
         sep = raw.find(b"\r\n\r\n")
         if sep < 0:
-            print("[Dexcom] No HTTP header in response, raw[:80]:", bytes(buf)[:80])
+            if DEBUG_NET:
+                print("[Dexcom] No HTTP header in response, raw[:80]:", raw[:80])
             return None, None
 
         head = raw[:sep].decode("utf-8", "ignore")
@@ -603,11 +804,14 @@ def _dexcom_post(host, path, json_body=""):
         else:
             body_str = body_raw
 
-        print("[Dexcom] HTTP", status, "| body[:100]:", body_str[:100])
+        if DEBUG_NET:
+            print("[Dexcom] HTTP", status, "| body[:100]:", body_str[:100])
         return status, body_str
 
     except Exception as e:
-        print("[Dexcom] POST error:", e)
+        if DEBUG_NET:
+            print("[Dexcom] POST error:", e)
+        _ADDR_CACHE.pop((host, 443), None)
         return None, None
     finally:
         try:
@@ -618,13 +822,13 @@ def _dexcom_post(host, path, json_body=""):
 
 
 def fetch_dexcom():
-    """Fetch latest glucose readings from Dexcom Share. Returns same dict as parse_entries_from_text."""
+    """Fetch latest glucose readings from Dexcom Share. Returns same dict as parse_ns_entries."""
     global _dexcom_session
 
     if not DEXCOM_USERNAME or not DEXCOM_PASSWORD:
         return None
 
-    host = "shareous1.dexcom.com" if DEXCOM_REGION.lower() == "ous" else "share2.dexcom.com"
+    host = DEXCOM_HOST
     login_path = "/ShareWebServices/Services/General/LoginPublisherAccountByName"
     read_path_tmpl = (
         "/ShareWebServices/Services/Publisher/ReadPublisherLatestGlucoseValues"
@@ -636,19 +840,22 @@ def fetch_dexcom():
         body = '{{"accountName":"{}","password":"{}","applicationId":"{}"}}'.format(
             DEXCOM_USERNAME, DEXCOM_PASSWORD, _DEXCOM_APP_ID
         )
-        print("[Dexcom] Logging in as:", DEXCOM_USERNAME)
+        if DEBUG_NET:
+            print("[Dexcom] Logging in as:", DEXCOM_USERNAME)
         status, resp = _dexcom_post(host, login_path, body)
         if status == 200 and resp:
             sid = resp.strip().strip('"')
             if len(sid) > 10 and sid != "00000000-0000-0000-0000-000000000000":
                 _dexcom_session = sid
-                print("[Dexcom] Login OK, session:", sid[:8], "...")
+                if DEBUG_NET:
+                    print("[Dexcom] Login OK, session:", sid[:8], "...")
                 return True
-            if sid == "00000000-0000-0000-0000-000000000000":
-                print("[Dexcom] Login rejected: invalid credentials (check username/password)")
-            else:
-                print("[Dexcom] Login 200 but unexpected body:", resp[:80])
-        else:
+            if DEBUG_NET:
+                if sid == "00000000-0000-0000-0000-000000000000":
+                    print("[Dexcom] Login rejected: invalid credentials (check username/password)")
+                else:
+                    print("[Dexcom] Login 200 but unexpected body:", resp[:80])
+        elif DEBUG_NET:
             print("[Dexcom] Login failed, status:", status)
         _dexcom_session = None
         return False
@@ -656,13 +863,15 @@ def fetch_dexcom():
     for _attempt in range(2):
         if not _dexcom_session:
             if not _login():
-                print("[Dexcom] Aborting after failed login")
+                if DEBUG_NET:
+                    print("[Dexcom] Aborting after failed login")
                 return None
 
         status, resp = _dexcom_post(host, read_path_tmpl.format(_dexcom_session))
 
         if status in (None, 401, 500):
-            print("[Dexcom] Readings request returned", status, "- will re-login")
+            if DEBUG_NET:
+                print("[Dexcom] Readings request returned", status, "- will re-login")
             _dexcom_session = None  # session expired; retry with fresh login
             continue
 
@@ -697,85 +906,174 @@ def fetch_dexcom():
         prev_val, _ = _find_int_after(resp, '"Value":', p1)
         delta = None
         if prev_val is not None:
-            diff = float(cur_val) - float(prev_val)
-            delta = diff if str(DISPLAY_UNITS).lower() == "mgdl" else diff / 18.0
+            delta = mgdl_to_units(int(cur_val) - int(prev_val))
 
-        direction = _DEXCOM_TREND_MAP.get(cur_trend, "NONE") if cur_trend is not None else "NONE"
+        direction = _TREND_DIR.get(cur_trend, "NONE") if cur_trend is not None else "NONE"
+        bg = mgdl_to_units(cur_val)
         return {
-            "bg":        mgdl_to_units(cur_val),
-            "time_ms":   time_ms,
-            "direction": direction,
-            "arrow":     direction_to_arrow(direction),
-            "delta":     delta,
+            "bg":         bg,
+            "time_ms":    time_ms,
+            "direction":  direction,
+            "arrow":      direction_to_arrow(direction),
+            "bg_text":    fmt_bg(bg),
+            "delta_text": fmt_delta(delta),
         }
 
     return None
 
 
-def fetch_and_parse():
+async def fetch_and_parse():
     """Unified data fetch: routes to Nightscout or Dexcom Share based on DATA_SOURCE config."""
     if DATA_SOURCE == "dexcom_share":
-        return fetch_dexcom()
-    # Default: Nightscout
-    txt = fetch_ns_text()
-    return parse_entries_from_text(txt)
+        parsed = fetch_dexcom()
+    else:
+        # Default: Nightscout
+        parsed = parse_ns_entries(await fetch_ns_body(), last)
+    if parsed and parsed is not last:
+        # Reading age in wall-clock terms is taken once here; the draw path
+        # advances it from ticks_ms instead of calling utime.time() per frame
+        parsed["fetched_ms"] = utime.ticks_ms()
+        parsed["age_s"] = now_unix_s() - parsed["time_ms"] // 1000
+
+        # Colours depend only on the reading, so pick them once per fetch
+        bg_val = parsed["bg"]
+        bg_color = GREEN
+        if bg_val <= LOW_THRESHOLD:
+            bg_color = RED
+        elif bg_val >= HIGH_THRESHOLD:
+            bg_color = YELLOW
+        parsed["bg_color"] = bg_color
+
+        direction = parsed["direction"]
+        arrow_color = WHITE
+        if ALERT_DOUBLE_UP and direction == "DoubleUp":
+            arrow_color = YELLOW
+        elif ALERT_DOUBLE_DOWN and direction == "DoubleDown":
+            arrow_color = RED
+        parsed["arrow_color"] = arrow_color
+    return parsed
 
 
 # ---------------------------------------------------------------------------
 
-def parse_entries_from_text(txt):
-    if not txt:
+# Nightscout field keys, matched directly against the response bytes
+_KEY_SGV   = b'"sgv":'
+_KEY_MILLS = b'"mills":'
+_KEY_DATE  = b'"date":'
+_KEY_DIR   = b'"direction":'
+_KEY_TREND = b'"trend":'
+
+_WS_B = (0x20, 0x09, 0x0D, 0x0A)  # space, tab, CR, LF
+
+
+def _find_int_after_b(b, key, start=0):
+    # bytes variant of _find_int_after; no str decode of the body
+    i = b.find(key, start)
+    if i < 0:
+        return None, -1
+    i += len(key)
+    n = len(b)
+
+    while i < n and b[i] in _WS_B:
+        i += 1
+
+    j = i
+
+    # Optional minus sign
+    if j < n and b[j] == 0x2D:
+        j += 1
+
+    while j < n and 0x30 <= b[j] <= 0x39:
+        j += 1
+
+    if j == i or (j == i + 1 and b[i] == 0x2D):
+        return None, -1
+
+    return int(b[i:j]), j
+
+
+def _find_str_after_b(b, key, start=0):
+    # bytes variant of _find_str_after; only the value itself is decoded
+    i = b.find(key, start)
+    if i < 0:
+        return None, -1
+    i += len(key)
+    n = len(b)
+
+    while i < n and b[i] in _WS_B:
+        i += 1
+
+    q1 = b.find(b'"', i)
+    if q1 < 0:
+        return None, -1
+    q2 = b.find(b'"', q1 + 1)
+    if q2 < 0:
+        return None, -1
+
+    return b[q1 + 1:q2].decode(), q2 + 1
+
+
+def parse_ns_entries(raw, prev=None):
+    # prev: the reading currently shown; returned as-is when raw carries the
+    # same sample, skipping the trend/delta work and the new result dict
+    if not raw:
         return None
 
-    cur_sgv, p = _find_int_after(txt, '"sgv":')
+    cur_sgv, p = _find_int_after_b(raw, _KEY_SGV)
     if cur_sgv is None:
         return None
 
-    cur_mills, p2 = _find_int_after(txt, '"mills":', p)
+    cur_mills, p2 = _find_int_after_b(raw, _KEY_MILLS, p)
     if cur_mills is None:
-        cur_mills, _ = _find_int_after(txt, '"date":', p)
+        cur_mills, _ = _find_int_after_b(raw, _KEY_DATE, p)
 
-    direction, p3 = _find_str_after(txt, '"direction":', 0)  # search from start, not p, so field order doesn't matter
+    time_ms = int(cur_mills or 0)
+    if prev is not None and prev["time_ms"] == time_ms:
+        return prev
+
+    direction, p3 = _find_str_after_b(raw, _KEY_DIR, 0)  # search from start, not p, so field order doesn't matter
 
     # Fallback: some CGM bridges omit "direction" and only send a numeric "trend"
     if not direction or direction == "NONE":
-        trend_num, _ = _find_int_after(txt, '"trend":', 0)
+        trend_num, _ = _find_int_after_b(raw, _KEY_TREND, 0)
         if trend_num is not None:
-            direction = {1:"DoubleUp", 2:"SingleUp", 3:"FortyFiveUp", 4:"Flat",
-                         5:"FortyFiveDown", 6:"SingleDown", 7:"DoubleDown"}.get(trend_num)
+            direction = _TREND_DIR.get(trend_num)
 
-    prev_sgv, _ = _find_int_after(txt, '"sgv":', p)
+    prev_sgv, _ = _find_int_after_b(raw, _KEY_SGV, p)
 
     delta_units = None
     if prev_sgv is not None:
-        diff = float(cur_sgv) - float(prev_sgv)
-        if str(DISPLAY_UNITS).lower() == "mgdl":
-            delta_units = diff
-        else:
-            delta_units = diff / 18.0
+        delta_units = mgdl_to_units(cur_sgv - prev_sgv)
 
+    bg = mgdl_to_units(cur_sgv)
     return {
-        "bg": mgdl_to_units(cur_sgv),
-        "time_ms": int(cur_mills or 0),
+        "bg": bg,
+        "time_ms": time_ms,
         "direction": direction or "NONE",
         "arrow": direction_to_arrow(direction),
-        "delta": delta_units,
+        # Pre-formatted once per fetch; the draw path runs every second
+        "bg_text": fmt_bg(bg),
+        "delta_text": fmt_delta(delta_units),
     }
 
 def fmt_bg(bg_val) -> str:
     if bg_val is None:
         return "---"
     try:
-        if str(DISPLAY_UNITS).lower() == "mgdl":
-            return str(int(round(bg_val)))
-        return "{:.1f}".format(float(bg_val))
+        if _IS_MGDL:
+            if isinstance(bg_val, int):
+                return str(bg_val)
+            return str(int(bg_val + 0.5))
+        return "%.1f" % bg_val
     except:
         return "ERR"
 
 def fmt_delta(delta_val) -> str:
     if delta_val is None:
         return ""
-    return "{:+.0f}".format(delta_val) if str(DISPLAY_UNITS).lower() == "mgdl" else "{:+.1f}".format(delta_val)
+    if _IS_MGDL:
+        return "%+d" % int(delta_val)
+    return "%+.1f" % delta_val
 
 # ============================
 # PARTIAL UPDATE DRAW SECTION
@@ -799,21 +1097,20 @@ class ScreenState:
         self.last_have_data = False
         self.wifi_lost = False
 
+        # Padded boxes of the text now on screen; clearing the old text
+        # reuses these instead of measuring it again
+        self.age_box = None
+        self.bg_box = None
+        self.arrow_box = None
+        self.delta_box = None
+
+        self.layout = None  # filled once by compute_layout()
+        self.age_next_ms = 0  # ticks_ms when the age text next changes (see task_heartbeat)
+
 
 
 def _clear_rect(lcd, x, y, w, h, color=BLACK):
-    if x < 0:
-        w += x
-        x = 0
-    if y < 0:
-        h += y
-        y = 0
-    if x + w > lcd.width:
-        w = lcd.width - x
-    if y + h > lcd.height:
-        h = lcd.height - y
-    if w <= 0 or h <= 0:
-        return
+    # framebuf.fill_rect is C and clips to the buffer itself
     lcd.fill_rect(x, y, w, h, color)
 
 def _bbox_text(wr, text, x, y, pad=2):
@@ -841,20 +1138,16 @@ def _union_rect(r1, r2):
 
 
 def _draw_age_if_changed(lcd, w_age_small, new_text, new_color, st, y_age):
+    if st.age_text == new_text and st.age_color == new_color:
+        return
+
     W = lcd.width
     new_w = w_age_small.stringlen(new_text)
     x_new = (W - new_w) // 2
 
-    if st.age_text == new_text and st.age_color == new_color:
-        return
-
-    old_bbox = None
-    if st.age_text is not None:
-        old_w = w_age_small.stringlen(st.age_text)
-        x_old = (W - old_w) // 2
-        old_bbox = _bbox_text(w_age_small, st.age_text, x_old, y_age, pad=3)
+    old_bbox = st.age_box if st.age_text is not None else None
 
-    new_bbox = _bbox_text(w_age_small, new_text, x_new, y_age, pad=3)
+    new_bbox = (x_new - 3, y_age - 3, new_w + 6, w_age_small.font.height() + 6)
     dirty = _union_rect(old_bbox, new_bbox)
 
     # One clear + draw, then ONE flush
@@ -868,21 +1161,18 @@ def _draw_age_if_changed(lcd, w_age_small, new_text, new_color, st, y_age):
 
     st.age_text = new_text
     st.age_color = new_color
+    st.age_box = new_bbox
 
 
-def _draw_heart_if_changed(lcd, w_heart, heart_on, st, x_heart, y_heart, pad=2):
+def _draw_heart_if_changed(lcd, w_heart, heart_on, st, x_heart, y_heart, dirty):
+    # dirty = padded heart box, precomputed by compute_layout
     if st.heart_on == heart_on:
         return
 
-    heart_w = w_heart.stringlen("T")
-    heart_h = w_heart.font.height()
-
-    dirty = (x_heart - pad, y_heart - pad, heart_w + pad * 2, heart_h + pad * 2)
-
     _clear_rect(lcd, dirty[0], dirty[1], dirty[2], dirty[3], BLACK)
 
     if heart_on:
-        w_heart.setcolor(RED, BLACK)
+        # w_heart is built RED-on-BLACK and never recoloured
         w_heart.set_textpos(lcd, y_heart, x_heart)
         w_heart.printstring("T")
 
@@ -891,20 +1181,16 @@ def _draw_heart_if_changed(lcd, w_heart, heart_on, st, x_heart, y_heart, pad=2):
 
 
 def _draw_bg_if_changed(lcd, w_large, new_text, new_color, st, y_bg):
+    if st.bg_text == new_text and st.bg_color == new_color:
+        return
+
     W = lcd.width
-    H = w_large.font.height()
+    H = st.layout["big_h"]
 
     new_w = w_large.stringlen(new_text)
     x_new = (W - new_w) // 2
 
-    if st.bg_text == new_text and st.bg_color == new_color:
-        return
-
-    old_bbox = None
-    if st.bg_text is not None:
-        old_w = w_large.stringlen(st.bg_text)
-        x_old = (W - old_w) // 2
-        old_bbox = (x_old - 6, y_bg - 6, old_w + 12, H + 12)
+    old_bbox = st.bg_box if st.bg_text is not None else None
 
     new_bbox = (x_new - 6, y_bg - 6, new_w + 12, H + 12)
     dirty = _union_rect(old_bbox, new_bbox)
@@ -919,6 +1205,7 @@ def _draw_bg_if_changed(lcd, w_large, new_text, new_color, st, y_bg):
 
     st.bg_text = new_text
     st.bg_color = new_color
+    st.bg_box = new_bbox
 
 
 
@@ -933,9 +1220,7 @@ def _draw_arrow_if_changed(lcd, w_arrow, new_text, new_color, st, x_arrow, y_arr
     if st.arrow_text == new_text and st.arrow_color == new_color:
         return
 
-    old_bbox = None
-    if st.arrow_text is not None:
-        old_bbox = _bbox_text(w_arrow, st.arrow_text, x_arrow, y_arrow, pad=3)
+    old_bbox = st.arrow_box if st.arrow_text is not None else None
 
     new_bbox = _bbox_text(w_arrow, new_text, x_arrow, y_arrow, pad=3)
     dirty = _union_rect(old_bbox, new_bbox)
@@ -950,6 +1235,7 @@ def _draw_arrow_if_changed(lcd, w_arrow, new_text, new_color, st, x_arrow, y_arr
 
     st.arrow_text = new_text
     st.arrow_color = new_color
+    st.arrow_box = new_bbox
 
 
 def _draw_delta_if_changed(lcd, w_small, w_delta_icon, new_delta_text, st, y_delta, right_margin=4):
@@ -957,26 +1243,14 @@ def _draw_delta_if_changed(lcd, w_small, w_delta_icon, new_delta_text, st, y_del
         return
 
     W = lcd.width
+    L = st.layout
     gap = 12
     v_offset = -8
     NUM_Y_OFFSET = -5   # negative = up, positive = down
     NUM_X_OFFSET = -5    # negative = left, positive = right
 
 
-    # Compute old box
-    old_bbox = None
-    if st.delta_text:
-        old_sign = st.delta_text[0]
-        old_num = st.delta_text[1:] if len(st.delta_text) > 1 else ""
-
-        num_w = w_small.stringlen(old_num)
-        sign_w = w_delta_icon.stringlen(old_sign)
-        total_w = sign_w + gap + num_w
-
-        h = max(w_small.font.height(), w_delta_icon.font.height())
-        x = W - right_margin - total_w - 6
-        y = y_delta - 8
-        old_bbox = (x, y, total_w + 12, h + 16)
+    old_bbox = st.delta_box if st.delta_text else None
 
     # If new is empty, just clear old and flush once
     if not new_delta_text:
@@ -984,14 +1258,15 @@ def _draw_delta_if_changed(lcd, w_small, w_delta_icon, new_delta_text, st, y_del
             _clear_rect(lcd, old_bbox[0], old_bbox[1], old_bbox[2], old_bbox[3], BLACK)
             _show_rect(lcd, old_bbox[0], old_bbox[1], old_bbox[2], old_bbox[3])
         st.delta_text = new_delta_text
+        st.delta_box = None
         return
 
     # Compute new box
     sign = new_delta_text[0]
     val_num = new_delta_text[1:]
 
-    h_small = w_small.font.height()
-    h_delta = w_delta_icon.font.height()
+    h_small = L["small_h"]
+    h_delta = L["delta_h"]
     y_delta_centered = y_delta + (h_small - h_delta) // 2 + v_offset
 
     num_w = w_small.stringlen(val_num)
@@ -1011,7 +1286,8 @@ def _draw_delta_if_changed(lcd, w_small, w_delta_icon, new_delta_text, st, y_del
 
     _clear_rect(lcd, dirty[0], dirty[1], dirty[2], dirty[3], BLACK)
 
-    w_delta_icon.setcolor(WHITE, BLACK)
+    # w_delta_icon keeps its constructor colours; w_small is shared with
+    # other screens, so it is reset here
     w_small.setcolor(WHITE, BLACK)
 
     w_delta_icon.set_textpos(lcd, y_delta_centered, x_sign)
@@ -1023,24 +1299,57 @@ def _draw_delta_if_changed(lcd, w_small, w_delta_icon, new_delta_text, st, y_del
     _show_rect(lcd, dirty[0], dirty[1], dirty[2], dirty[3])
 
     st.delta_text = new_delta_text
+    st.delta_box = new_bbox
 
 
-def draw_loading_once(lcd, writer, st):
-    gc.collect()
-    # DON'T clear - logo is already showing
-    # Just overlay the message at the bottom
-    writer.setcolor(WHITE, BLACK)
-    writer.set_textpos(lcd, 195, 220)  # Bottom of 320x240 screen
-    writer.printstring(":)")
-
-    # Only update the small region where we wrote
-    if hasattr(lcd, 'show_rect'):
-        lcd.show_rect(220, 190, 80, 40)
-    else:
-        lcd.show()
+def compute_layout(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon):
+    """Screen positions for the data fields; depends only on fonts and panel size."""
+    W, H = lcd.width, lcd.height
 
-    
+    y_age = 6
+    heart_right_margin = 10
 
+    age_small_h = w_age_small.font.height()
+    heart_h = w_heart.font.height()
+    heart_w = w_heart.stringlen("T")
+
+    x_heart = W - heart_right_margin - heart_w
+    y_heart = y_age + (age_small_h - heart_h) // 4
+    heart_pad = 2
+    heart_box = (x_heart - heart_pad, y_heart - heart_pad,
+                 heart_w + heart_pad * 2, heart_h + heart_pad * 2)
+
+    big_h = w_large.font.height()
+    small_h = w_small.font.height()
+    arrow_h = w_arrow.font.height()
+    bottom_h = max(small_h, arrow_h)
+
+    y_bg = (H - big_h) // 2
+
+    y_bottom_base = H - bottom_h - 1
+    arrow_offset = -2
+    x_arrow = 10
+    y_arrow = (y_bottom_base + (bottom_h - arrow_h) // 2) + arrow_offset
+    y_delta = y_bottom_base + (bottom_h - small_h) // 2
+    delta_h = w_delta_icon.font.height()
+
+    return {
+        "y_age": y_age,
+        "x_heart": x_heart,
+        "y_heart": y_heart,
+        "heart_box": heart_box,
+        "y_bg": y_bg,
+        "x_arrow": x_arrow,
+        "y_arrow": y_arrow,
+        "y_delta": y_delta,
+        # Font heights the per-field helpers need when sizing dirty boxes
+        "big_h": big_h,
+        "small_h": small_h,
+        "delta_h": delta_h,
+    }
+
+
+@micropython.native
 def draw_all_fields_if_needed(
     lcd,
     w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon,
@@ -1055,17 +1364,14 @@ def draw_all_fields_if_needed(
     if st.wifi_lost:
         return
 
-    W, H = lcd.width, lcd.height
-
-    y_age = 6
-
     if not last:
         return
 
-    # If this is the FIRST time drawing data, clear the logo
-    if not st.last_have_data:
+    # If this is the FIRST time drawing data, clear the logo. The cleared
+    # frame is flushed together with the fields below, not pushed on its own.
+    cleared = not st.last_have_data
+    if cleared:
         lcd.fill(BLACK)
-        lcd.show()
         st.last_have_data = True
         # Reset all state so everything draws fresh
         st.age_text = None
@@ -1074,71 +1380,56 @@ def draw_all_fields_if_needed(
         st.delta_text = None
         st.heart_on = None
 
-    # Calculate layout positions
-    heart_right_margin = 10
-
-    age_small_h = w_age_small.font.height()
-    heart_h = w_heart.font.height()
-    heart_w = w_heart.stringlen("T")
-
-    x_heart = W - heart_right_margin - heart_w
-    y_heart = y_age + (age_small_h - heart_h) // 4
-
-    big_h = w_large.font.height()
-    small_h = w_small.font.height()
-    arrow_h = w_arrow.font.height()
-    bottom_h = max(small_h, arrow_h)
-
-    y_bg = (H - big_h) // 2
-
-    y_bottom_base = H - bottom_h - 1
-    arrow_offset = -2
-    x_arrow = 10
-    y_arrow = (y_bottom_base + (bottom_h - arrow_h) // 2) + arrow_offset
-    y_delta = y_bottom_base + (bottom_h - small_h) // 2
+    L = st.layout
+    if L is None:
+        L = st.layout = compute_layout(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon)
 
     # Draw all data fields
-    raw_s = last["time_ms"] // 1000
-    age_s = now_unix_s() - raw_s
+    now_ms = utime.ticks_ms()
+    age_s = last["age_s"] + utime.ticks_diff(now_ms, last["fetched_ms"]) // 1000
     if age_s < 0:
         age_s = 0
     mins = int((age_s + 30) // 60)
 
-    if mins == 1:
-        age_text = "1 min ago"
-    else:
-        age_text = str(mins) + " mins ago"
+    # ticks_ms at which the rounded age ticks over to mins + 1
+    st.age_next_ms = utime.ticks_add(now_ms, (mins * 60 + 30 - age_s) * 1000)
+
+    age_text = "1 min ago" if mins == 1 else "%d mins ago" % mins
     
     age_color = RED if mins >= STALE_MIN else WHITE
-    bg_val = last["bg"]
-    bg_text = fmt_bg(bg_val)
-
-    bg_color = GREEN
-    if bg_val <= LOW_THRESHOLD:
-        bg_color = RED
-    elif bg_val >= HIGH_THRESHOLD:
-        bg_color = YELLOW
-
-    direction = last["direction"]
+    bg_text = last["bg_text"]
+    bg_color = last["bg_color"]
     arrow_text = last["arrow"]
-    arrow_color = WHITE
-    if ALERT_DOUBLE_UP and direction == "DoubleUp":
-        arrow_color = YELLOW
-    elif ALERT_DOUBLE_DOWN and direction == "DoubleDown":
-        arrow_color = RED
-
-    delta_text = fmt_delta(last["delta"])
+    arrow_color = last["arrow_color"]
+    delta_text = last["delta_text"]
+
+    # Nothing on screen would change (common between 5-minute CGM readings)
+    if (st.heart_on == hb_state and st.delta_text == delta_text
+            and st.age_text == age_text and st.age_color == age_color
+            and st.bg_text == bg_text and st.bg_color == bg_color
+            and st.arrow_text == arrow_text and st.arrow_color == arrow_color):
+        return
 
     _begin_batch()
-    _draw_age_if_changed(lcd, w_age_small, age_text, age_color, st, y_age)
-    _draw_heart_if_changed(lcd, w_heart, hb_state, st, x_heart, y_heart, pad=2)
-    _draw_bg_if_changed(lcd, w_large, bg_text, bg_color, st, y_bg)
-    _draw_arrow_if_changed(lcd, w_arrow, arrow_text, arrow_color, st, x_arrow, y_arrow, x_offset=10, y_offset=-10)
-    _draw_delta_if_changed(lcd, w_small, w_delta_icon, delta_text, st, y_delta, right_margin=4)
+    if cleared:
+        _add_dirty((0, 0, lcd.width, lcd.height))
+    _draw_age_if_changed(lcd, w_age_small, age_text, age_color, st, L["y_age"])
+    _draw_heart_if_changed(lcd, w_heart, hb_state, st, L["x_heart"], L["y_heart"], L["heart_box"])
+    _draw_bg_if_changed(lcd, w_large, bg_text, bg_color, st, L["y_bg"])
+    _draw_arrow_if_changed(lcd, w_arrow, arrow_text, arrow_color, st, L["x_arrow"], L["y_arrow"], x_offset=10, y_offset=-10)
+    _draw_delta_if_changed(lcd, w_small, w_delta_icon, delta_text, st, L["y_delta"], right_margin=4)
     _end_batch(lcd)
 
 
-def draw_wifi_lost_screen(lcd, w_small, st):
+def draw_heart_only(lcd, w_heart, heart_on, st):
+    """Heartbeat blink: toggle just the heart once the data screen is up."""
+    if st.factory_mode or st.wifi_lost or not st.last_have_data:
+        return
+    L = st.layout
+    _draw_heart_if_changed(lcd, w_heart, heart_on, st, L["x_heart"], L["y_heart"], L["heart_box"])
+
+
+async def draw_wifi_lost_screen(lcd, w_small, st):
     if st.wifi_lost:
         return
     st.wifi_lost = True
@@ -1150,7 +1441,8 @@ def draw_wifi_lost_screen(lcd, w_small, st):
         x = max(0, (W - w_small.stringlen(msg)) // 2)
         w_small.set_textpos(lcd, y, x)
         w_small.printstring(msg)
-    lcd.show()
+    # Full-frame push in bands so the heartbeat/buzzer tasks run in between
+    await lcd.show_async()
 
 
 _BOOT_BTN = Pin(0, Pin.IN, Pin.PULL_UP)
@@ -1163,42 +1455,55 @@ async def task_factory_reset_button(lcd, w_small, st):
     # config_font (15px) has the letters we need; w_small (48px digits) for the countdown
     w_cfg = CWriter(lcd, font_config, fgcolor=WHITE, bgcolor=BLACK, verbose=False)
     fh_cfg = font_config.height()  # 15px
+    # Sleep until the button goes down instead of polling it every 50 ms
+    pressed = asyncio.ThreadSafeFlag()
+    _BOOT_BTN.irq(trigger=Pin.IRQ_FALLING, handler=lambda _p: pressed.set())
     while True:
         # Wait for button press (active-low)
         if _BOOT_BTN.value() != 0:
-            await asyncio.sleep_ms(50)
+            await pressed.wait()
             continue
         # --- Button is pressed: show warning screen ---
         st.factory_mode = True
         aborted = False
+        # Warning text is static: draw it and push the full frame once
+        lcd.fill(BLACK)
+        lines = [
+            ("Factory Reset",       RED),
+            ("Will erase your settings", WHITE),
+            ("Full setup will be needed",  WHITE),
+            ("Release to cancel",   WHITE),
+        ]
+        y = 60
+        for text, color in lines:
+            w_cfg.setcolor(color, BLACK)
+            x = max(0, (W - w_cfg.stringlen(text)) // 2)
+            w_cfg.set_textpos(lcd, y, x)
+            w_cfg.printstring(text)
+            y += fh_cfg + 8
+        await lcd.show_async()
+        cy = H // 2 + 60
+        prev_box = None
         for secs_left in range(5, -1, -1):
             # Re-check: if button was released, abort
             if _BOOT_BTN.value() != 0:
                 aborted = True
                 break
-            # Draw warning screen using config_font for text, w_small for digit
-            lcd.fill(BLACK)
-            lines = [
-                ("Factory Reset",       RED),
-                ("Will erase your settings", WHITE),
-                ("Full setup will be needed",  WHITE),
-                ("Release to cancel",   WHITE),
-            ]
-            y = 60
-            for text, color in lines:
-                w_cfg.setcolor(color, BLACK)
-                x = max(0, (W - w_cfg.stringlen(text)) // 2)
-                w_cfg.set_textpos(lcd, y, x)
-                w_cfg.printstring(text)
-                y += fh_cfg + 8
-            # Countdown digit — centered, lower half of screen
+            # Countdown digit — centered, lower half of screen. Only the old
+            # and new digit boxes are cleared and flushed each tick.
             countdown = str(secs_left)
             cx = max(0, (W - w_small.stringlen(countdown)) // 2)
-            cy = H // 2 + 60
+            box = _bbox_text(w_small, countdown, cx, cy)
+            _begin_batch()
+            if prev_box:
+                _clear_rect(lcd, *prev_box)
+                _show_rect(lcd, *prev_box)
             w_small.setcolor(RED, BLACK)
             w_small.set_textpos(lcd, cy, cx)
             w_small.printstring(countdown)
-            lcd.show()
+            _show_rect(lcd, *box)
+            _end_batch(lcd)
+            prev_box = box
             if secs_left == 0:
                 break  # countdown done — execute reset below
             # Poll button every 100 ms for up to 1 second so release is detected fast
@@ -1228,6 +1533,13 @@ async def task_factory_reset_button(lcd, w_small, st):
 
 async def task_heartbeat(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st):
     global hb_state, last, wdt, factory_reset_exit_requested
+
+    # Hot names bound once; this loop runs every second for the device's life
+    ticks_ms = utime.ticks_ms
+    ticks_diff = utime.ticks_diff
+    draw_full = draw_all_fields_if_needed
+    draw_heart = draw_heart_only
+    sleep_ms = asyncio.sleep_ms
     
     while True:
         if wdt:
@@ -1237,10 +1549,14 @@ async def task_heartbeat(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w
         if factory_reset_exit_requested:
             factory_reset_exit_requested = False
             
-            # Clear screen
-            lcd.fill(BLACK)
-            lcd.show()
-            
+            if last and not st.wifi_lost:
+                # The full draw below clears and flushes the panel in one go
+                st.last_have_data = False
+            else:
+                # Nothing to draw over the warning; just clear it
+                lcd.fill(BLACK)
+                await lcd.show_async()
+
             # Reset state to force full redraw
             st.age_text = None
             st.bg_text = None
@@ -1249,22 +1565,33 @@ async def task_heartbeat(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w
             st.heart_on = None
 
         hb_state = not hb_state
-        draw_all_fields_if_needed(
-            lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon,
-            hb_state, st
-        )
-        await asyncio.sleep(1)
-
-
-async def task_age_redraw(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st):
-    global last, hb_state
-    while True:
-        if last:
-            draw_all_fields_if_needed(
+        # Only the heart changes between ticks, unless the age text is due to
+        # roll over or the screen state was reset (heart_on cleared)
+        if st.heart_on is None or ticks_diff(ticks_ms(), st.age_next_ms) >= 0:
+            draw_full(
                 lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon,
                 hb_state, st
             )
-        await asyncio.sleep(60)
+        else:
+            draw_heart(lcd, w_heart, hb_state, st)
+        await sleep_ms(1000)
+
+
+# Base poll interval, and the CGM's sample period it backs off towards
+FETCH_MS = const(5000)
+CGM_PERIOD_S = const(300)
+FETCH_MAX_MS = const(60000)
+
+def _next_fetch_ms(age_s):
+    """Delay before the next poll when the last one returned no new sample.
+
+    Aims a few seconds past when the next CGM reading should reach the
+    server, capped at FETCH_MAX_MS; late readings fall back to FETCH_MS.
+    """
+    ms = (CGM_PERIOD_S + 10 - age_s) * 1000
+    if ms < FETCH_MS:
+        return FETCH_MS
+    return ms if ms < FETCH_MAX_MS else FETCH_MAX_MS
 
 
 async def task_glucose_fetch(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st):
@@ -1272,19 +1599,19 @@ async def task_glucose_fetch(lcd, w_large, w_small, w_age_small, w_arrow, w_hear
 
     await asyncio.sleep(1 if wifi_ok else 60)
 
+    wlan = _STA
     while True:
         if wdt:
             wdt.feed()
 
         # Detect WiFi drop
         try:
-            wlan = network.WLAN(network.STA_IF)
             connected = wlan.active() and wlan.isconnected()
         except Exception:
             connected = False
 
         if not connected:
-            draw_wifi_lost_screen(lcd, w_small, st)
+            await draw_wifi_lost_screen(lcd, w_small, st)
             await asyncio.sleep_ms(5000)
             continue
 
@@ -1298,51 +1625,76 @@ async def task_glucose_fetch(lcd, w_large, w_small, w_age_small, w_arrow, w_hear
             st.delta_text = None
             st.heart_on = None
 
+        wait_ms = FETCH_MS
         try:
-            parsed = fetch_and_parse()
-            if parsed:
+            prev_time_ms = last["time_ms"] if last else None
+            parsed = await fetch_and_parse()
+            if parsed is not None and parsed is last:
+                # Same sample as on screen: nothing to redraw. Alerts are still
+                # re-checked so one resumes as soon as a snooze runs out.
+                wait_ms = _next_fetch_ms(
+                    last["age_s"] + utime.ticks_diff(utime.ticks_ms(), last["fetched_ms"]) // 1000)
+                check_glucose_alerts(last["bg"])
+            elif parsed:
+                if parsed["time_ms"] == prev_time_ms:
+                    wait_ms = _next_fetch_ms(parsed["age_s"])
                 last = parsed
                 check_glucose_alerts(last["bg"])
                 draw_all_fields_if_needed(
                     lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon,
                     hb_state, st
                 )
-            gc.collect()
+                # New reading parsed and drawn: collect now, while nothing is
+                # mid-flush, rather than on some later allocation
+                gc.collect()
         except Exception as e:
             pass
 
-        await asyncio.sleep_ms(5000)
+        # Wait in FETCH_MS slices so a WiFi drop is still noticed promptly
+        while wait_ms > 0:
+            await asyncio.sleep_ms(FETCH_MS if wait_ms > FETCH_MS else wait_ms)
+            wait_ms -= FETCH_MS
+            if not wlan.isconnected():
+                break
+
+async def task_ntp_resync():
+    # Keeps the RTC honest for reading ages, on its own schedule rather than
+    # the fetch backoff's; a failed sync is retried after FETCH_MAX_MS
+    global ntp_ok
+    while True:
+        await asyncio.sleep_ms(NTP_RESYNC_MS if ntp_ok else FETCH_MAX_MS)
+        ntp_ok = _STA.isconnected() and ntp_sync()
 
 async def task_buzzer_stop_button():
-    # Simple debounce + edge detect
-    last_state = 1
-    stable_count = 0
+    # Sleeps on a falling-edge IRQ instead of polling; debounce once woken
     DEBOUNCE_MS = 30
     POLL_MS = 10
 
+    flag = asyncio.ThreadSafeFlag()
+    BTN_STOP.irq(trigger=Pin.IRQ_FALLING, handler=lambda _p: flag.set())
+
     while True:
-        s = BTN_STOP.value()
-        if s == last_state:
+        await flag.wait()
+
+        # Press (active-low) must stay stable long enough
+        stable_count = 0
+        while BTN_STOP.value() == 0 and stable_count < DEBOUNCE_MS:
+            await asyncio.sleep_ms(POLL_MS)
             stable_count += POLL_MS
-        else:
-            stable_count = 0
-            last_state = s
 
-        # Press detected (active-low) and stable long enough
-        if s == 0 and stable_count >= DEBOUNCE_MS:
+        if stable_count >= DEBOUNCE_MS:
             request_buzzer_stop()
             # Wait until release so it only fires once per press
             while BTN_STOP.value() == 0:
                 await asyncio.sleep_ms(20)
-            stable_count = 0
-            last_state = 1
-
-        await asyncio.sleep_ms(POLL_MS)
 
 async def task_buzzer_driver():
     global buzzer_mode, last_mild_beep_time
 
     while True:
+        # Clear before reading buzzer_mode: a change made while a pattern
+        # plays leaves the event set, so the idle below returns at once
+        _BUZZER_WAKE.clear()
         now = utime.ticks_ms()
         snoozed = utime.ticks_diff(now, buzzer_snooze_until) < 0
 
@@ -1372,7 +1724,7 @@ async def task_buzzer_driver():
                 # 3-beep sequence, repeated 3 times with a 1-second gap
                 stopped = False
                 for _rep in range(3):
-                    if stopped:
+                    if stopped or buzzer_mode != 2:
                         break
                     for _ in range(3):
                         if BTN_STOP.value() == 0:
@@ -1386,12 +1738,27 @@ async def task_buzzer_driver():
                 last_mild_beep_time = utime.ticks_ms()
 
             BUZ.value(1)
-            await asyncio.sleep_ms(100)
+            if buzzer_mode != 2:
+                continue  # escalated or cleared mid-pattern
+            # Idle until the cooldown runs out or the alert mode changes
+            wait_ms = MILD_COOLDOWN_MS - utime.ticks_diff(utime.ticks_ms(), last_mild_beep_time)
+            await _buzzer_idle(wait_ms)
             continue
 
-        # Otherwise OFF
+        # Otherwise OFF: nothing to do until check_glucose_alerts raises one
         BUZ.value(1)
-        await asyncio.sleep_ms(100)
+        await _buzzer_idle(None)
+
+
+async def _buzzer_idle(timeout_ms):
+    # The driver loop clears _BUZZER_WAKE at the top of each pass
+    if timeout_ms is None:
+        await _BUZZER_WAKE.wait()
+        return
+    try:
+        await asyncio.wait_for_ms(_BUZZER_WAKE.wait(), max(timeout_ms, 100))
+    except asyncio.TimeoutError:
+        pass
 
 
 
@@ -1403,7 +1770,7 @@ async def task_wifi_reconnect(st):
             continue
         if wdt:
             wdt.feed()
-        connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+        await connect_wifi_async(WIFI_SSID, WIFI_PASSWORD)
         if wdt:
             wdt.feed()
 
@@ -1418,9 +1785,9 @@ async def async_main(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_del
     await asyncio.sleep(2)
 
     asyncio.create_task(task_heartbeat(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st))
-    asyncio.create_task(task_age_redraw(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st))
     asyncio.create_task(task_glucose_fetch(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon, st))
     asyncio.create_task(task_wifi_reconnect(st))
+    asyncio.create_task(task_ntp_resync())
 
     while True:
         if wdt:
@@ -1453,6 +1820,8 @@ SEVERE_LOW_THRESHOLD = ALERT_SEVERE_THRESHOLD
 
 # Buzzer mode: 0=off, 1=severe solid, 2=mild pattern
 buzzer_mode = 0
+# Set whenever buzzer_mode changes so task_buzzer_driver can sleep while idle
+_BUZZER_WAKE = asyncio.Event()
 
 last_mild_beep_time = utime.ticks_add(utime.ticks_ms(), -BUZZER_SNOOZE_MS)
 MILD_COOLDOWN_MS = BUZZER_SNOOZE_MS
@@ -1474,16 +1843,17 @@ def check_glucose_alerts(bg_value):
 
     # SEVERE has priority (if enabled)
     if ALERT_SEVERE_ENABLED and bg_value <= SEVERE_LOW_THRESHOLD:
-        buzzer_mode = 1
-        return
-
+        mode = 1
     # MILD (if enabled)
-    if ALERT_LOW_ENABLED and bg_value <= MILD_LOW_THRESHOLD:
-        buzzer_mode = 2
-        return
-
+    elif ALERT_LOW_ENABLED and bg_value <= MILD_LOW_THRESHOLD:
+        mode = 2
     # No alerts triggered
-    buzzer_mode = 0
+    else:
+        mode = 0
+
+    if mode != buzzer_mode:
+        buzzer_mode = mode
+        _BUZZER_WAKE.set()
 
             
 # ============================
@@ -1491,10 +1861,7 @@ def check_glucose_alerts(bg_value):
 # ============================
 
 def main(framebuffer=None):
-    import utime
-    import network
-
-    global last, hb_state, wdt, wifi_ok
+    global last, hb_state, wdt, wifi_ok, ntp_ok
     last = None
     hb_state = True
     wdt = None
@@ -1513,6 +1880,9 @@ def main(framebuffer=None):
         if mod in sys.modules:
             del sys.modules[mod]
     gc.collect()
+    # Collect after each quarter-heap of new allocation as well, so garbage
+    # from draws and fetches never piles up into one long pause
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
 
     # 2. INIT WRITERS
     w_large = CWriter(lcd, large_font, fgcolor=WHITE, bgcolor=BLACK, verbose=False)
@@ -1529,18 +1899,21 @@ def main(framebuffer=None):
     w_arrow.set_spacing(8)
 
     st = ScreenState()
+    st.layout = compute_layout(lcd, w_large, w_small, w_age_small, w_arrow, w_heart, w_delta_icon)
+    # The panel was cleared and pushed in step 1, so the first data draw needs
+    # no second full-frame clear; later screens (WiFi lost) reset this flag.
+    st.last_have_data = True
 
     # 4. WIFI
-    sta = network.WLAN(network.STA_IF)
-    wifi_ok = sta.isconnected() or connect_wifi(WIFI_SSID, WIFI_PASSWORD)
+    wifi_ok = _STA.isconnected() or asyncio.run(connect_wifi_async(WIFI_SSID, WIFI_PASSWORD))
     gc.collect()
 
     if wifi_ok:
-        ntp_sync()
+        ntp_ok = ntp_sync()
 
     # 5. INITIAL DATA FETCH
     try:
-        parsed = fetch_and_parse()
+        parsed = asyncio.run(fetch_and_parse())
         if parsed:
             last = parsed
             check_glucose_alerts(last["bg"])
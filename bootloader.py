@@ -1,6 +1,6 @@
 #bootloader.py - ESP32-S3 version
 
-from machine import Pin
+from machine import Pin, PWM
 
 # ESP32-S3: Buzzer disabled for bootloader
 # (Not needed during setup/config)
@@ -15,6 +15,11 @@ import ujson as json
 import os
 import gc
 import machine
+from micropython import const
+
+# Interface objects, built once and shared by the WiFi/update/setup paths
+_STA = network.WLAN(network.STA_IF)
+_AP = network.WLAN(network.AP_IF)
 
 # ---------- Reset helper ---------
 
@@ -43,10 +48,12 @@ GITHUB_USER   = "SLWRTHNU"
 GITHUB_REPO   = "Iris-Mini"
 # TEST BRANCH — change to "main" for production
 GITHUB_BRANCH = "main"
-RAW_BASE = "https://raw.githubusercontent.com/{}/{}/{}".format(
-    GITHUB_USER, GITHUB_REPO, GITHUB_BRANCH)
+RAW_HOST   = "raw.githubusercontent.com"
+RAW_PREFIX = "/{}/{}/{}".format(GITHUB_USER, GITHUB_REPO, GITHUB_BRANCH)
+RAW_BASE   = "https://" + RAW_HOST + RAW_PREFIX
 
 VERSIONS_PATH      = "versions.json"
+VERSIONS_ETAG_FILE = "versions.etag"
 LOCAL_VERSION_FILE = "local_version.txt"
 DEVICE_ID_FILE     = "device_id.txt"
 
@@ -56,19 +63,18 @@ def raw_url(path):
 
 # ---------- Display driver ----------
 
-YELLOW = 0xFFE0
-RED    = 0xF800
-GREEN  = 0x07E0
-BLUE   = 0x001F
-BLACK  = 0x0000
-WHITE  = 0xFFFF
+YELLOW = const(0xFFE0)
+RED    = const(0xF800)
+GREEN  = const(0x07E0)
+BLACK  = const(0x0000)
+WHITE  = const(0xFFFF)
 
 LOGO_FILE  = "logo.bin"
-LOGO_W     = 320
-LOGO_H     = 240
-BAR_HEIGHT = 12
-Y_POS      = 227  # 240 - 13 (bottom of screen)
-STATUS_X   = 3
+LOGO_W     = const(320)
+LOGO_H     = const(240)
+BAR_HEIGHT = const(12)
+Y_POS      = const(227)  # 240 - 13 (bottom of screen)
+STATUS_X   = const(3)
 
 # ---------- LCD hard reset/backlight ----------
 LCD_BL_PIN = 21
@@ -78,7 +84,6 @@ _BL_PWM = None
 def _lcd_backlight_set(pct):
     # pct: 0-100
     global _BL_PWM
-    from machine import Pin, PWM
     if _BL_PWM is None:
         _BL_PWM = PWM(Pin(LCD_BL_PIN))
         _BL_PWM.freq(1000)
@@ -86,7 +91,6 @@ def _lcd_backlight_set(pct):
     _BL_PWM.duty_u16(int(pct * 655.35))
 
 def _lcd_hard_reset():
-    from machine import Pin
     rst = Pin(LCD_RST_PIN, Pin.OUT)
     rst.value(1)
     time.sleep_ms(50)
@@ -103,14 +107,13 @@ def init_lcd():
         return _LCD_INSTANCE
     try:
         from display_2inch import lcd_st7789 as LCD_Driver
-        import utime
 
         # Give the power rail a moment to settle
-        utime.sleep_ms(100)
+        time.sleep_ms(100)
 
         # Fixed brightness during boot (no potentiometer on Mini)
         _lcd_backlight_set(80)
-        utime.sleep_ms(100)
+        time.sleep_ms(100)
 
         # Initialize the driver with landscape 320×240 framebuffer
         lcd = LCD_Driver(fb=bytearray(320 * 240 * 2))
@@ -118,7 +121,7 @@ def init_lcd():
         # Buffer is already zeroed (black); draw_boot_screen() will show it.
         
         # Give the driver a moment
-        utime.sleep_ms(200)
+        time.sleep_ms(200)
         lcd.display_update = lcd.show
         
         _LCD_INSTANCE = lcd
@@ -133,7 +136,6 @@ def init_lcd():
 def backlight_dim_early(pct=50):
     # Runs before LCD_Driver() to prevent initial full-bright flash
     global _BL_PWM
-    from machine import Pin, PWM
     if _BL_PWM is None:
         _BL_PWM = PWM(Pin(LCD_BL_PIN))
         _BL_PWM.freq(1000)
@@ -168,28 +170,46 @@ def gh_contents_url(path):
     return API_BASE + path.lstrip("/") + "?ref=" + GITHUB_BRANCH
 
 # ---------- UI helpers ----------
-def draw_bottom_status(lcd, status_msg, show_id=None):
-    if lcd is None:
-        return
-
-    if show_id is None:
-        show_id = any(status_msg.startswith(x) for x in ["Connecting", "Connected", "ERR:", "Updating", "Saving"])
-
-    lcd.fill_rect(0, Y_POS - 1, lcd.width, BAR_HEIGHT, WHITE)
-    lcd.text(status_msg, STATUS_X, Y_POS, BLACK)
-
-    if show_id:
+# Status bar with the device ID already drawn in, rendered on first use.
+# Later ID-bearing status updates copy it into the framebuffer and only
+# draw the status text on top.
+_ID_BAR = None
+
+def _id_bar_template(lcd):
+    global _ID_BAR
+    if _ID_BAR is None:
+        import framebuf
         device_id = "N/A"
         try:
-            if DEVICE_ID_FILE in os.listdir():
-                with open(DEVICE_ID_FILE, "r") as f:
-                    device_id = f.read().strip()
-        except:
+            with open(DEVICE_ID_FILE, "r") as f:
+                device_id = f.read().strip()
+        except OSError:
             pass
 
-        id_text = "ID:{}".format(device_id)
+        buf = bytearray(lcd.width * BAR_HEIGHT * 2)
+        fb = framebuf.FrameBuffer(buf, lcd.width, BAR_HEIGHT, framebuf.RGB565)
+        fb.fill(WHITE)
+        id_text = "ID:" + device_id
         id_x = lcd.width - (len(id_text) * 8) - 3
-        lcd.text(id_text, id_x, Y_POS, BLACK)
+        fb.text(id_text, id_x, 1, BLACK)
+        _ID_BAR = buf
+    return _ID_BAR
+
+def draw_bottom_status(lcd, status_msg, show_id=False, flush=True):
+    if lcd is None:
+        return
+
+    if show_id and lcd.buffer is not None:
+        # Bar spans full rows, so it is one contiguous slice of the framebuffer
+        bar = _id_bar_template(lcd)
+        off = (Y_POS - 1) * lcd.width * 2
+        memoryview(lcd.buffer)[off:off + len(bar)] = bar
+    else:
+        lcd.fill_rect(0, Y_POS - 1, lcd.width, BAR_HEIGHT, WHITE)
+    lcd.text(status_msg, STATUS_X, Y_POS, BLACK)
+
+    if not flush:
+        return  # caller is about to push the whole frame
 
     # fast partial update if supported
     if hasattr(lcd, "show_rect"):
@@ -201,13 +221,19 @@ def draw_boot_screen(lcd):
     if lcd is None:
         return
     logo_ok = False
+    streamed = False
     try:
-        size = os.stat(LOGO_FILE)[6]
-        if size == LOGO_W * LOGO_H * 2:
-            # Exact match (320×240) — load directly into framebuffer
+        if hasattr(lcd, "show_rgb565_bin"):
+            # Stream the file through the driver's staging buffer to the panel:
+            # one flash read, no 150 KB framebuffer write and re-read. Nothing
+            # redraws the logo from the framebuffer afterwards.
+            lcd.show_rgb565_bin(LOGO_FILE, LOGO_W, LOGO_H)
+            logo_ok = streamed = True
+        else:
+            # Read straight into the framebuffer (no intermediate buffer); only
+            # an exact 320x240 RGB565 image fills it completely
             with open(LOGO_FILE, "rb") as f:
-                f.readinto(lcd.buffer)
-            logo_ok = True
+                logo_ok = f.readinto(lcd.buffer) == LOGO_W * LOGO_H * 2 and not f.read(1)
     except:
         pass
 
@@ -231,8 +257,14 @@ def draw_boot_screen(lcd):
             lcd.text("Starting up...", (lcd.width - 112) // 2, lcd.height // 2 + 10, WHITE)
 
     gc.collect()
+    if streamed:
+        # Logo is already on the panel; only the bar rows need pushing
+        draw_bottom_status(lcd, "Booting...")
+        return
+    # Bar goes into the frame first so the full push carries it; no second
+    # windowed write of the same rows
+    draw_bottom_status(lcd, "Booting...", flush=False)
     lcd.show()
-    draw_bottom_status(lcd, "Booting...")
 
 # ---------- WiFi ----------
 def load_config_wifi():
@@ -260,14 +292,14 @@ def connect_wifi(lcd, ssid, pwd, timeout_sec=45, retries=2):
     if not ssid:
         return False
 
-    draw_bottom_status(lcd, "Connecting")
+    draw_bottom_status(lcd, "Connecting", show_id=True)
 
-    ap = network.WLAN(network.AP_IF)
+    ap = _AP
     if ap.active():
         ap.active(False)
         time.sleep_ms(500)
 
-    sta = network.WLAN(network.STA_IF)
+    sta = _STA
 
     try:
         network.hostname("Iris-Mini")
@@ -292,16 +324,22 @@ def connect_wifi(lcd, ssid, pwd, timeout_sec=45, retries=2):
         sta.connect(ssid, pwd)
 
         t0 = time.ticks_ms()
+        deadline = time.ticks_add(t0, timeout_sec * 1000)
         last_ui = t0
+        last_pct = -1
 
-        while time.ticks_diff(time.ticks_ms(), t0) < timeout_sec * 1000:
+        now = t0
+        while time.ticks_diff(deadline, now) > 0:
             status = sta.status()
 
-            now = time.ticks_ms()
             if time.ticks_diff(now, last_ui) >= 1000:
                 last_ui = now
                 pct = _wifi_progress_pct(t0, timeout_sec)
-                draw_bottom_status(lcd, "Connecting {}%".format(pct), show_id=True)
+                # Only build the label and redraw when the number moves
+                # (it sits at 99% once the timeout is nearly used up)
+                if pct != last_pct:
+                    last_pct = pct
+                    draw_bottom_status(lcd, "Connecting %d%%" % pct, show_id=True)
 
             if sta.isconnected():
                 draw_bottom_status(lcd, "Connected 100%", show_id=True)
@@ -312,22 +350,158 @@ def connect_wifi(lcd, ssid, pwd, timeout_sec=45, retries=2):
                 draw_bottom_status(lcd, "ERR: WiFi {}".format(status), show_id=True)
                 break
 
-            time.sleep_ms(200)
+            time.sleep_ms(100)
+            now = time.ticks_ms()
 
         time.sleep_ms(800)
 
     return False
 
 # ---------- Update check ----------
-def fetch_versions_json(lcd):
-    """Fetch versions.json from raw CDN. Returns parsed dict or None."""
-    import urequests as requests
+
+# One kept-alive TLS connection to the raw CDN, shared by the version check
+# and every file of an update, so each request skips its own handshake
+_GH_SOCK = None
+_GH_BUF = None
+GH_CHUNK = const(2048)  # one TLS record's worth; fewer writes per file
+_GH_ETAG = None  # ETag of the last _gh_get response, if it sent one
+
+def _gh_close():
+    global _GH_SOCK
+    try:
+        if _GH_SOCK:
+            _GH_SOCK.close()
+    except:
+        pass
+    _GH_SOCK = None
+
+def _gh_open():
+    import usocket, ssl
+    addr = usocket.getaddrinfo(RAW_HOST, 443)[0][-1]
+    s = usocket.socket()
+    s.settimeout(15)
+    try:
+        s.connect(addr)
+        return ssl.wrap_socket(s, server_hostname=RAW_HOST)
+    except:
+        s.close()
+        raise
+
+def _gh_get(path, sink, etag=None):
+    """GET a repo path over the shared connection, passing body chunks to sink.
+
+    With etag, the request is conditional and an unchanged file comes back
+    as a bodiless 304. Returns the HTTP status, or None when the response
+    can't be read as a Content-Length body on a reusable connection
+    (callers then fall back to urequests).
+    """
+    global _GH_SOCK, _GH_BUF, _GH_ETAG
+    req = ("GET {}/{} HTTP/1.1\r\nHost: {}\r\nUser-Agent: Iris\r\n{}"
+           "Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n").format(
+               RAW_PREFIX, path.lstrip("/"), RAW_HOST,
+               "If-None-Match: {}\r\n".format(etag) if etag else "").encode()
+    _GH_ETAG = None
+
+    for _ in range(2):
+        # A reused socket may have been closed by the server; retry fresh once
+        reused = _GH_SOCK is not None
+        status = None
+        try:
+            if not reused:
+                _GH_SOCK = _gh_open()
+            s = _GH_SOCK
+            s.write(req)
+
+            line = s.readline()
+            if not line:
+                _gh_close()
+                if reused:
+                    continue
+                return None
+            status = int(line.split(None, 2)[1])
+
+            length = -1
+            keep = True
+            while True:
+                line = s.readline()
+                if not line or line == b"\r\n":
+                    break
+                k = line.lower()
+                if k.startswith(b"content-length:"):
+                    length = int(k[15:])
+                elif k.startswith(b"connection:") and b"close" in k:
+                    keep = False
+                elif k.startswith(b"etag:"):
+                    _GH_ETAG = line[5:].strip().decode()
+
+            if status == 304:
+                if not keep:
+                    _gh_close()
+                return status
+
+            if status != 200 or length < 0:
+                _gh_close()
+                return status if length >= 0 else None
+
+            if _GH_BUF is None:
+                _GH_BUF = bytearray(GH_CHUNK)
+            mv = memoryview(_GH_BUF)
+            while length > 0:
+                n = s.readinto(mv if length >= GH_CHUNK else mv[:length])
+                if not n:
+                    raise OSError("short body")
+                sink(mv[:n])
+                length -= n
+
+            if not keep:
+                _gh_close()
+            return status
+        except Exception as e:
+            _gh_close()
+            if reused and status is None:
+                continue
+            return None
+    return None
+
+# fetch_versions_json result when the server answered 304 Not Modified
+VERSIONS_UNCHANGED = "unchanged"
+
+def fetch_versions_json(lcd, local_v=""):
+    """Fetch versions.json from raw CDN.
+
+    Returns the parsed dict, VERSIONS_UNCHANGED on a 304, or None on failure.
+    """
     # Cache-bust so CDN doesn't return a stale copy
-    url = raw_url(VERSIONS_PATH) + "?nocache={}".format(time.ticks_ms())
+    nocache = "?nocache={}".format(time.ticks_ms())
+
+    # versions.etag holds "<local version>\n<etag>", saved when versions.json
+    # matched that installed version. Only send it while local_version.txt
+    # still says the same, so a 304 really means "nothing to download".
+    etag = None
+    try:
+        with open(VERSIONS_ETAG_FILE) as f:
+            saved_v, saved_tag = f.read().split("\n", 1)
+        if saved_v.strip() == local_v:
+            etag = saved_tag.strip() or None
+    except (OSError, ValueError):
+        pass
+
+    body = bytearray()
+    status = _gh_get(VERSIONS_PATH + nocache, body.extend, etag)
+    if status is not None:
+        if status == 304:
+            return VERSIONS_UNCHANGED
+        try:
+            return json.loads(bytes(body)) if status == 200 else None
+        except Exception as e:
+            return None
+
+    import urequests as requests
+    url = raw_url(VERSIONS_PATH) + nocache
     r = None
     try:
         gc.collect()
-        r = requests.get(url, headers={"User-Agent": "Iris", "Connection": "close"}, timeout=8)
+        r = requests.get(url, headers={"User-Agent": "Iris", "Accept-Encoding": "identity", "Connection": "close"}, timeout=8)
         if r.status_code != 200:
             return None
         return json.loads(r.text)
@@ -343,15 +517,46 @@ def fetch_versions_json(lcd):
 
 
 
+def _make_dirs_for(out_path):
+    # Ensure folders exist
+    if "/" in out_path:
+        parts = out_path.split("/")[:-1]
+        cur = ""
+        for p in parts:
+            cur = p if cur == "" else (cur + "/" + p)
+            try:
+                os.mkdir(cur)
+            except:
+                pass
+
 def gh_download_to_file(path, out_path):
+    global _GH_BUF
+    gc.collect()
+    _make_dirs_for(out_path)
+    try:
+        with open(out_path, "wb") as f:
+            status = _gh_get(path, f.write)
+        log_kv("dl status {}".format(out_path), status)
+        if status == 200:
+            # Closing the file commits it; perform_update syncs once for all
+            return True
+    except Exception as e:
+        status = None
+    if status is not None:
+        try:
+            os.remove(out_path)
+        except:
+            pass
+        return False
+
+    # Shared connection unusable: fall back to a one-off urequests download
     import urequests as requests
 
     url = raw_url(path)
     r = None
-    gc.collect()
     try:
         gc.collect()
-        r = requests.get(url, headers={"User-Agent": "Iris", "Connection": "close"}, timeout=15)
+        r = requests.get(url, headers={"User-Agent": "Iris", "Accept-Encoding": "identity", "Connection": "close"}, timeout=15)
 
         log_kv("dl status {}".format(out_path), r.status_code)
         raw = getattr(r, "raw", None)
@@ -360,28 +565,25 @@ def gh_download_to_file(path, out_path):
         if r.status_code != 200 or not raw:
             return False
 
-        # Ensure folders exist
-        if "/" in out_path:
-            parts = out_path.split("/")[:-1]
-            cur = ""
-            for p in parts:
-                cur = p if cur == "" else (cur + "/" + p)
-                try:
-                    os.mkdir(cur)
-                except:
-                    pass
-
+        # Same fixed buffer as _gh_get; each chunk goes to flash as it
+        # arrives while lwIP keeps receiving into the TCP window
         with open(out_path, "wb") as f:
-            while True:
-                chunk = raw.read(1024)
-                if not chunk:
-                    break
-                f.write(chunk)
-
-        try:
-            os.sync()
-        except:
-            pass
+            if hasattr(raw, "readinto"):
+                if _GH_BUF is None:
+                    _GH_BUF = bytearray(GH_CHUNK)
+                mv = memoryview(_GH_BUF)
+                while True:
+                    n = raw.readinto(mv)
+                    if not n:
+                        break
+                    f.write(mv[:n])
+            else:
+                # Still chunked; never buffer the whole file via r.content
+                while True:
+                    b = raw.read(GH_CHUNK)
+                    if not b:
+                        break
+                    f.write(b)
 
         return True
 
@@ -408,12 +610,22 @@ def _safe_swap(target):
     tmp = target + ".new"
     bak = target + ".old"
 
+    # LittleFS renames over an existing file atomically: one directory
+    # update, and a power cut leaves either the old or the new file
+    try:
+        os.rename(tmp, target)
+        return True
+    except:
+        pass
+
     # nothing to swap
     try:
         os.stat(tmp)
     except:
         return False
 
+    # Filesystems that refuse to rename over a file (FAT): go via a backup
+
     # remove old backup
     try:
         os.remove(bak)
@@ -448,6 +660,36 @@ def _safe_swap(target):
 
     return True
 
+def _git_blob_sha(path):
+    """Git blob id (hex SHA-1) of a local file, or None if it can't be read."""
+    global _GH_BUF
+    try:
+        import hashlib, binascii
+        h = hashlib.sha1(("blob %d\0" % os.stat(path)[6]).encode())
+        if _GH_BUF is None:
+            _GH_BUF = bytearray(GH_CHUNK)
+        mv = memoryview(_GH_BUF)
+        with open(path, "rb") as f:
+            while True:
+                n = f.readinto(mv)
+                if not n:
+                    break
+                h.update(mv[:n])
+        return binascii.hexlify(h.digest()).decode()
+    except Exception:
+        return None
+
+def _write_local_version(v):
+    try:
+        with open(LOCAL_VERSION_FILE, "w") as f:
+            f.write(v)
+        try:
+            os.sync()
+        except:
+            pass
+    except Exception as e:
+        pass
+
 def perform_update(vers_data, lcd):
     SKIP_ALWAYS = ("github_token.py", "config.py", "local_version.txt", "main.py")
     STAGE_ONLY  = ("bootloader.py",)
@@ -467,23 +709,33 @@ def perform_update(vers_data, lcd):
             continue
         if t in SKIP_ALWAYS:
             continue
+        # Optional per-file git blob sha: skip files already up to date
+        sha = f.get("sha")
+        if sha and _git_blob_sha(t) == sha:
+            continue
         if t in STAGE_ONLY:
             work_stage.append((p, t))
         else:
             work_swap.append((p, t))
 
     if not work_swap and not work_stage:
+        # Nothing changed on disk; just record the version, no reboot needed
+        _write_local_version(remote_v)
         return True
 
     total = len(work_swap) + len(work_stage)
     done = 0
 
     # 1) DOWNLOAD everything to .new
+    # Per-file GETs share one keep-alive TLS connection (_gh_get), so N files
+    # cost one handshake; a repo tarball would pull every asset (logo.bin,
+    # fonts) from a second host just to update a file or two.
+    t_dl = time.ticks_ms()
     for p, t in (work_swap + work_stage):
         done += 1
-        pct = int((done * 100) / total)
+        pct = done * 100 // total
         if lcd:
-            draw_bottom_status(lcd, "Updating {}%".format(pct), show_id=True)
+            draw_bottom_status(lcd, "Updating %d%%" % pct, show_id=True)
 
         if not gh_download_to_file(p, t + ".new"):
             return False
@@ -492,6 +744,7 @@ def perform_update(vers_data, lcd):
         os.sync()
     except:
         pass
+    log_kv("dl ms", time.ticks_diff(time.ticks_ms(), t_dl))
 
     # 2) SWAP normal files (bootloader stays staged)
     if lcd:
@@ -502,22 +755,14 @@ def perform_update(vers_data, lcd):
             return False
 
     # 3) Write local version
-    try:
-        with open(LOCAL_VERSION_FILE, "w") as f:
-            f.write(remote_v)
-        try:
-            os.sync()
-        except:
-            pass
-    except Exception as e:  # <-- Move this to align with the outer try
-        pass
+    _write_local_version(remote_v)
 
     # 4) Reboot (bootloader.py.new applies on next boot via apply_staged_bootloader_if_present)
     if lcd:
         draw_bottom_status(lcd, "Restarting...", show_id=True)
 
     try:
-        network.WLAN(network.STA_IF).active(False)
+        _STA.active(False)
     except:
         pass
 
@@ -608,7 +853,7 @@ def show_wifi_failed(lcd):
 
 # ---------- Setup mode (imports only when needed) ----------
 def run_setup_mode(lcd):
-    ap = network.WLAN(network.AP_IF)
+    ap = _AP
     ap.active(True)
     ap.config(essid="Iris Mini", security=0)
     ip = "192.168.4.1"
@@ -654,7 +899,7 @@ def release_bootloader_resources():
 
 # ---------- Runner ----------
 def main():
-    global _LCD_INSTANCE, _BL_PWM
+    global _LCD_INSTANCE, _BL_PWM, _ID_BAR
     
     apply_staged_bootloader_if_present()
     
@@ -662,7 +907,6 @@ def main():
     
     # CHECK FOR CONFIG FIRST
     try:
-        import os
         if "config.py" not in os.listdir():
             # No config found - enter setup mode immediately
             lcd = init_lcd()
@@ -704,14 +948,25 @@ def main():
     except:
         pass
 
-    vers = fetch_versions_json(lcd)
-    if vers:
+    vers = fetch_versions_json(lcd, local_v)
+    if vers is VERSIONS_UNCHANGED:
+        pass  # 304: versions.json still matches the installed version
+    elif vers:
         remote_v = (vers.get("version") or "").strip()
         if remote_v and remote_v != local_v:
             # perform_update writes local_version.txt and reboots on success;
             # on failure it returns False and we continue booting with old code.
             perform_update(vers, lcd)
+        elif _GH_ETAG:
+            # Up to date: remember this copy so the next boot can get a 304.
+            # Only saved here, so a failed update is retried on the next boot.
+            try:
+                with open(VERSIONS_ETAG_FILE, "w") as f:
+                    f.write(local_v + "\n" + _GH_ETAG)
+            except OSError:
+                pass
     # If versions match (or fetch failed) fall through to app_main normally.
+    _gh_close()
 
     # Save framebuffer BEFORE cleanup
     saved_fb = lcd.buffer if lcd else None
@@ -720,9 +975,11 @@ def main():
     if _LCD_INSTANCE:
         _LCD_INSTANCE.spi = None
         _LCD_INSTANCE.palette = None
-        _LCD_INSTANCE._linebuf = None
+        _LCD_INSTANCE._txbuf = None
+        _LCD_INSTANCE._txv = None
         _LCD_INSTANCE = None
     _BL_PWM = None
+    _ID_BAR = None
     
     # Free modules
     import sys
@@ -2,19 +2,25 @@
 import utime as time
 import network
 import machine
-import urequests as requests
-import json
+import ujson as json
 import os
 
 CONTROL_POLL_MS = 60_000 # 5 seconds for testing
 _last_poll_ms = 0
 LAST_REBOOT_REV_FILE = "last_control_hash.txt"
+_STA = network.WLAN(network.STA_IF)
+
+_DEVICE_ID = None
 
 def _get_device_id():
-    try:
-        with open("device_id.txt", "r") as f:
-            return f.read().strip()
-    except: return "N/A"
+    # The ID never changes while the app runs; read the file on first poll only
+    global _DEVICE_ID
+    if _DEVICE_ID is None:
+        try:
+            with open("device_id.txt", "r") as f:
+                _DEVICE_ID = f.read().strip()
+        except: _DEVICE_ID = "N/A"
+    return _DEVICE_ID
 
 def _get_last_reboot_rev():
     try:
@@ -37,7 +43,6 @@ def _save_reboot_rev(rev):
             f.write(rev_str)
             
         # 3. Force a sync to the physical disk
-        import os
         if hasattr(os, 'sync'):
             os.sync()
             
@@ -45,31 +50,102 @@ def _save_reboot_rev(rev):
     except Exception as e:
         print("APP: Save error:", e)
 
-def fetch_control_json():
-    r = None
+CONTROL_HOST = "raw.githubusercontent.com"
+CONTROL_PATH = "/SLWRTHNU/Iris-Classic/main/control.json"
+CONTROL_ETAG_FILE = "control.etag"
+# ETag of the last fully handled control.json, and the last_control_hash.txt
+# contents it was handled against; unchanged polls get a 304
+_CONTROL_ETAG = None
+_CONTROL_ETAG_REV = None
+
+def _load_control_etag():
+    # Kept on flash ("<rev>\n<etag>") so the first poll after a reboot can
+    # still get a 304
+    global _CONTROL_ETAG, _CONTROL_ETAG_REV
     try:
-        # Hardcoded, direct URL
-        url = "https://raw.githubusercontent.com/SLWRTHNU/Iris-Classic/main/control.json"
-        
-        # Adding a basic header
-        headers = {'User-Agent': 'MicroPython'}
-        
-        r = requests.get(url, headers=headers)
-        
-        print("POLL: Status Code", r.status_code)
-        
-        if r.status_code == 200:
-            return r.json()
-            
-        return None
-    except Exception as e:
-        print("POLL: Fetch Error:", e)
+        with open(CONTROL_ETAG_FILE, "r") as f:
+            rev, etag = f.read().split("\n", 1)
+        _CONTROL_ETAG_REV = rev.strip()
+        _CONTROL_ETAG = etag.strip() or None
+    except:
+        _CONTROL_ETAG = _CONTROL_ETAG_REV = None
+
+def _valid_control_etag():
+    # Only trusted while last_control_hash.txt exists and still holds the rev
+    # it was saved with; a missing or rewritten file forces a full fetch
+    if not _CONTROL_ETAG:
         return None
+    try:
+        with open(LAST_REBOOT_REV_FILE, "r") as f:
+            rev = f.read().strip()
+    except: return None
+    return _CONTROL_ETAG if rev == _CONTROL_ETAG_REV else None
+
+def _set_control_etag(etag, rev=None):
+    global _CONTROL_ETAG, _CONTROL_ETAG_REV
+    if etag == _CONTROL_ETAG and rev == _CONTROL_ETAG_REV:
+        return
+    _CONTROL_ETAG = etag
+    _CONTROL_ETAG_REV = rev
+    try:
+        if etag:
+            with open(CONTROL_ETAG_FILE, "w") as f:
+                f.write("{}\n{}".format(rev or "", etag))
+        else:
+            os.remove(CONTROL_ETAG_FILE)
+    except: pass
+
+_load_control_etag()
+
+def _https_get_json(host, path, etag=None):
+    # Minimal one-shot GET: status line and headers via readline(), body by
+    # Content-Length (HTTP/1.0, so never chunked). Avoids keeping urequests
+    # resident in the app. Returns (data, etag); data is None unless 200.
+    import usocket, ssl
+    s = None
+    try:
+        addr = usocket.getaddrinfo(host, 443)[0][-1]
+        s = usocket.socket()
+        s.settimeout(10)
+        s.connect(addr)
+        s = ssl.wrap_socket(s, server_hostname=host)
+        s.write(("GET {} HTTP/1.0\r\nHost: {}\r\nUser-Agent: MicroPython\r\n"
+                 "Accept-Encoding: identity\r\n{}\r\n").format(path, host,
+                 "If-None-Match: {}\r\n".format(etag) if etag else "").encode())
+
+        status = int(s.readline().split(None, 2)[1])
+        print("POLL: Status Code", status)
+
+        length = -1
+        new_etag = None
+        while True:
+            line = s.readline()
+            if not line or line == b"\r\n":
+                break
+            k = line.lower()
+            if k.startswith(b"content-length:"):
+                length = int(line[15:])
+            elif k.startswith(b"etag:"):
+                new_etag = line[5:].strip().decode()
+
+        if status != 200:
+            return None, None
+        body = s.read(length) if length >= 0 else s.read()
+        return json.loads(body), new_etag
     finally:
-        if r:
-            try: r.close()
+        if s:
+            try: s.close()
             except: pass
 
+def fetch_control_json():
+    try:
+        # A 304 (unchanged since the last handled copy) comes back as no
+        # data, same as "nothing to do"
+        return _https_get_json(CONTROL_HOST, CONTROL_PATH, _valid_control_etag())
+    except Exception as e:
+        print("POLL: Fetch Error:", e)
+        return None, None
+
 def tick(lcd=None):
     global _last_poll_ms
     now = time.ticks_ms()
@@ -80,15 +156,15 @@ def tick(lcd=None):
     print("--- POLL START ---")
     _last_poll_ms = now
 
-    sta = network.WLAN(network.STA_IF)
+    sta = _STA
     if not (sta.active() and sta.isconnected()):
         return
 
     try:
-        data = fetch_control_json()
+        data, etag = fetch_control_json()
         if not data: return
 
-        my_id = str(_get_device_id()).strip()
+        my_id = _get_device_id()
         remote_rev = str(data.get("rev", "")).strip()
         reboot_ids = [str(x) for x in data.get("reboot_ids", [])]
         last_rev = _get_last_reboot_rev()
@@ -111,11 +187,17 @@ def tick(lcd=None):
                         pass # Wait for the dog to bite
                 else:
                     print("CRITICAL: Write failed, reboot cancelled.")
+                    # Fetch the full file again next poll so this is retried
+                    _set_control_etag(None)
+                    return
             else:
                 print("POLL: No new revision.")
         else:
             print("POLL: My ID not targeted.")
-            
+
+        # Fully handled: only now may later polls skip this copy via 304
+        _set_control_etag(etag, last_rev)
+
     except Exception as e:
         print("POLL: Logic Error:", e)
 
@@ -6,6 +6,7 @@
 from machine import Pin, SPI, PWM
 import framebuf
 import micropython
+import uasyncio as asyncio
 
 # ── GPIO pin assignments (same ESP32-S3 board as Iris Classic) ──────────────
 # Adjust these to match your physical wiring if different.
@@ -16,30 +17,105 @@ MOSI    = 11   # SPI MOSI
 LCD_RST = 13   # Reset (active-low pulse)
 LCD_BL  = 21   # Backlight PWM
 
+# Rows per SPI burst when streaming the framebuffer. Each burst is byte-swapped
+# into a small staging buffer so the large PSRAM framebuffer is read only once.
+TX_ROWS = 16
+
+
+# The two whole-buffer swaps work a 32-bit word (two pixels) at a time:
+# both 16-bit lanes are swapped with one mask/shift pair. Buffers and
+# offsets must be 4-byte aligned (true for bytearrays and whole-row offsets);
+# a trailing odd pixel is swapped on its own.
 
 @micropython.viper
 def _bswap16_inplace(buf):
-    b = ptr8(buf)
+    w32 = ptr32(buf)
     n = int(len(buf))
+    nw = n >> 2
     i = 0
-    while i < n:
-        t = b[i]
-        b[i] = b[i + 1]
-        b[i + 1] = t
-        i += 2
+    while i < nw:
+        w = w32[i]
+        w32[i] = ((w & 0x00FF00FF) << 8) | ((w >> 8) & 0x00FF00FF)
+        i += 1
+    if n & 2:
+        b = ptr8(buf)
+        t = b[n - 2]
+        b[n - 2] = b[n - 1]
+        b[n - 1] = t
 
 
 @micropython.viper
 def _bswap16_copy(src, src_off: int, dst, nbytes: int):
+    s = ptr32(src)
+    d = ptr32(dst)
+    so = src_off >> 2
+    nw = nbytes >> 2
+    i = 0
+    while i < nw:
+        w = s[so + i]
+        d[i] = ((w & 0x00FF00FF) << 8) | ((w >> 8) & 0x00FF00FF)
+        i += 1
+    if nbytes & 2:
+        s8 = ptr8(src)
+        d8 = ptr8(dst)
+        k = nbytes - 2
+        d8[k] = s8[src_off + k + 1]
+        d8[k + 1] = s8[src_off + k]
+
+
+@micropython.viper
+def _bswap16_rows(src, src_off: int, src_stride: int, dst, row_bytes: int, rows: int):
+    # Gather `rows` strided rows of `row_bytes` each into dst, byte-swapped
     s = ptr8(src)
     d = ptr8(dst)
-    i = 0
-    while i < nbytes:
-        lo = s[src_off + i]
-        hi = s[src_off + i + 1]
-        d[i] = hi
-        d[i + 1] = lo
-        i += 2
+    o = 0
+    r = 0
+    while r < rows:
+        si = src_off + r * src_stride
+        i = 0
+        while i < row_bytes:
+            d[o] = s[si + i + 1]
+            d[o + 1] = s[si + i]
+            o += 2
+            i += 2
+        r += 1
+
+
+# ST7789V init sequence run after sleep-out, as (cmd, n, data[n]) records.
+_INIT_SCRIPT = (
+    # Memory access control
+    # MADCTL = 0x70: MY=0, MX=1, MV=1, ML=1, RGB — landscape 320×240
+    # If colours appear wrong try 0x60 (without ML) or swap the BGR bit (0x78 / 0x68).
+    b"\x36\x01\x70"
+    # Colour format: 16-bit RGB565
+    b"\x3A\x01\x05"
+    # Porch setting
+    b"\xB2\x05\x0C\x0C\x00\x33\x33"
+    # Gate control
+    b"\xB7\x01\x35"
+    # VCOM setting
+    b"\xBB\x01\x19"
+    # LCM control
+    b"\xC0\x01\x2C"
+    # VDV and VRH enable
+    b"\xC2\x01\x01"
+    # VRH set
+    b"\xC3\x01\x12"
+    # VDV set
+    b"\xC4\x01\x20"
+    # Frame rate control (60 Hz)
+    b"\xC6\x01\x0F"
+    # Power control 1
+    b"\xD0\x02\xA4\xA1"
+    # Positive voltage gamma
+    b"\xE0\x0E\xD0\x04\x0D\x11\x13\x2B\x3F\x54\x4C\x18\x0D\x0B\x1F\x23"
+    # Negative voltage gamma
+    b"\xE1\x0E\xD0\x04\x0C\x11\x13\x2C\x3F\x44\x51\x2F\x1F\x1F\x20\x23"
+    # Display inversion on (required for correct colours on ST7789V)
+    b"\x21\x00"
+    # Display on
+    b"\x29\x00"
+)
 
 
 class Palette(framebuf.FrameBuffer):
@@ -50,6 +126,11 @@ class Palette(framebuf.FrameBuffer):
     def fg(self, color): self.pixel(1, 0, color)
 
 
+# One palette shared by every driver instance (bootloader and app_main each
+# construct an lcd_st7789); it is 2 pixels of scratch and holds no state.
+_PALETTE = Palette()
+
+
 class lcd_st7789(framebuf.FrameBuffer):
     """
     ST7789V driver for Waveshare 2inch LCD Module in landscape orientation.
@@ -74,8 +155,16 @@ class lcd_st7789(framebuf.FrameBuffer):
         self.spi = SPI(1, baud, polarity=0, phase=0,
                        sck=Pin(SCK), mosi=Pin(MOSI))
 
-        # Line buffer for partial-update row streaming
-        self._linebuf = bytearray(self.width * 2)
+        # One-byte scratch for single-byte commands/data
+        self._b1 = bytearray(1)
+
+        # CASET / RASET parameter scratch for _set_window
+        self._caset = bytearray(4)
+        self._raset = bytearray(4)
+
+        # Staging buffer for SPI bursts (TX_ROWS rows, big-endian) + its view
+        self._txbuf = bytearray(self.width * 2 * TX_ROWS)
+        self._txv = memoryview(self._txbuf)
 
         self.buffer = fb
 
@@ -85,7 +174,7 @@ class lcd_st7789(framebuf.FrameBuffer):
         else:
             super().__init__(fb, self.width, self.height, framebuf.RGB565)
 
-        self.palette = Palette()
+        self.palette = _PALETTE
 
         self._init_display()
 
@@ -98,14 +187,22 @@ class lcd_st7789(framebuf.FrameBuffer):
 
     # ── Low-level SPI helpers ────────────────────────────────────────────────
 
+    @micropython.native
     def write_cmd(self, cmd):
+        b1 = self._b1
+        b1[0] = cmd
         self.dc(0); self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.spi.write(b1)
         self.cs(1)
 
+    @micropython.native
     def write_data(self, data):
+        if isinstance(data, int):
+            b1 = self._b1
+            b1[0] = data
+            data = b1
         self.dc(1); self.cs(0)
-        self.spi.write(bytearray([data]) if isinstance(data, int) else data)
+        self.spi.write(data)
         self.cs(1)
 
     def bl_ctrl(self, duty):
@@ -113,11 +210,38 @@ class lcd_st7789(framebuf.FrameBuffer):
         self._bl_pwm.duty_u16(int(duty * 655.35))
 
     def _set_window(self, x0, y0, x1, y1):
-        self.write_cmd(0x2A)
-        self.write_data(bytearray([x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF]))
-        self.write_cmd(0x2B)
-        self.write_data(bytearray([y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF]))
-        self.write_cmd(0x2C)
+        ca = self._caset
+        ca[0] = x0 >> 8; ca[1] = x0 & 0xFF; ca[2] = x1 >> 8; ca[3] = x1 & 0xFF
+        ra = self._raset
+        ra[0] = y0 >> 8; ra[1] = y0 & 0xFF; ra[2] = y1 >> 8; ra[3] = y1 & 0xFF
+
+        # CASET / RASET / RAMWR in one CS-low burst; only DC toggles
+        dc = self.dc
+        spi = self.spi
+        self.cs(0)
+        dc(0); spi.write(b"\x2A")
+        dc(1); spi.write(ca)
+        dc(0); spi.write(b"\x2B")
+        dc(1); spi.write(ra)
+        dc(0); spi.write(b"\x2C")
+        self.cs(1)
+
+    def _run_script(self, script):
+        """Send a (cmd, n, data[n]) command script without per-byte buffers."""
+        mv = memoryview(script)
+        spi = self.spi
+        i = 0
+        end = len(script)
+        while i < end:
+            n = script[i + 1]
+            self.dc(0); self.cs(0)
+            spi.write(mv[i:i + 1])
+            self.cs(1)
+            if n:
+                self.dc(1); self.cs(0)
+                spi.write(mv[i + 2:i + 2 + n])
+                self.cs(1)
+            i += 2 + n
 
     # ── Display initialisation ───────────────────────────────────────────────
 
@@ -134,74 +258,34 @@ class lcd_st7789(framebuf.FrameBuffer):
         self.write_cmd(0x11)
         time.sleep_ms(120)
 
-        # Memory access control
-        # MADCTL = 0x70: MY=0, MX=1, MV=1, ML=1, RGB — landscape 320×240
-        # If colours appear wrong try 0x60 (without ML) or swap the BGR bit (0x78 / 0x68).
-        self.write_cmd(0x36); self.write_data(0x70)
-
-        # Colour format: 16-bit RGB565
-        self.write_cmd(0x3A); self.write_data(0x05)
-
-        # Porch setting
-        self.write_cmd(0xB2)
-        self.write_data(bytearray([0x0C, 0x0C, 0x00, 0x33, 0x33]))
-
-        # Gate control
-        self.write_cmd(0xB7); self.write_data(0x35)
-
-        # VCOM setting
-        self.write_cmd(0xBB); self.write_data(0x19)
-
-        # LCM control
-        self.write_cmd(0xC0); self.write_data(0x2C)
-
-        # VDV and VRH enable
-        self.write_cmd(0xC2); self.write_data(0x01)
-
-        # VRH set
-        self.write_cmd(0xC3); self.write_data(0x12)
-
-        # VDV set
-        self.write_cmd(0xC4); self.write_data(0x20)
-
-        # Frame rate control (60 Hz)
-        self.write_cmd(0xC6); self.write_data(0x0F)
-
-        # Power control 1
-        self.write_cmd(0xD0)
-        self.write_data(bytearray([0xA4, 0xA1]))
-
-        # Positive voltage gamma
-        self.write_cmd(0xE0)
-        self.write_data(bytearray([
-            0xD0, 0x04, 0x0D, 0x11, 0x13, 0x2B, 0x3F,
-            0x54, 0x4C, 0x18, 0x0D, 0x0B, 0x1F, 0x23
-        ]))
-
-        # Negative voltage gamma
-        self.write_cmd(0xE1)
-        self.write_data(bytearray([
-            0xD0, 0x04, 0x0C, 0x11, 0x13, 0x2C, 0x3F,
-            0x44, 0x51, 0x2F, 0x1F, 0x1F, 0x20, 0x23
-        ]))
-
-        # Display inversion on (required for correct colours on ST7789V)
-        self.write_cmd(0x21)
-
-        # Display on
-        self.write_cmd(0x29)
+        # Register setup, then display on
+        self._run_script(_INIT_SCRIPT)
         time.sleep_ms(20)
 
     # ── Framebuffer flush methods ────────────────────────────────────────────
 
+    @micropython.native
     def show(self):
         if self.buffer is None:
             raise RuntimeError("No framebuffer allocated. Use show_rgb565_bin().")
         self._set_window(0, 0, self.width - 1, self.height - 1)
         self.dc(1); self.cs(0)
-        _bswap16_inplace(self.buffer)
-        self.spi.write(self.buffer)
-        _bswap16_inplace(self.buffer)
+
+        # Swap-copy into the staging buffer and push it, rather than swapping
+        # the whole framebuffer in place twice around one blocking write.
+        src = self.buffer
+        tx = self._txbuf
+        step = len(tx)
+        total = len(src)
+        off = 0
+        while off < total:
+            n = total - off
+            if n > step:
+                n = step
+            _bswap16_copy(src, off, tx, n)
+            self.spi.write(tx if n == step else self._txv[:n])
+            off += n
+
         self.cs(1)
 
     def show_rect(self, x, y, w, h):
@@ -224,16 +308,35 @@ class lcd_st7789(framebuf.FrameBuffer):
         start = y0 * row_bytes + x0 * 2
         copy_bytes = w * 2
 
+        # Pack as many window rows as fit into the staging buffer per write
         src = self.buffer
-        linebuf = self._linebuf
-
-        for row in range(h):
-            si = start + row * row_bytes
-            _bswap16_copy(src, si, linebuf, copy_bytes)
-            self.spi.write(memoryview(linebuf)[:copy_bytes])
+        tx = self._txbuf
+        txv = self._txv
+        rows_per = len(tx) // copy_bytes
+
+        row = 0
+        while row < h:
+            n = h - row
+            if n > rows_per:
+                n = rows_per
+            _bswap16_rows(src, start + row * row_bytes, row_bytes, tx, copy_bytes, n)
+            self.spi.write(txv[:n * copy_bytes])
+            row += n
 
         self.cs(1)
 
+    async def show_async(self):
+        """Full-frame flush that yields to the scheduler between bursts.
+
+        Each band of TX_ROWS rows is sent as its own windowed transaction,
+        so other tasks may run (and call show_rect) between bands.
+        """
+        if self.buffer is None:
+            raise RuntimeError("No framebuffer allocated. Use show_rgb565_bin().")
+        for y in range(0, self.height, TX_ROWS):
+            self.show_rect(0, y, self.width, TX_ROWS)
+            await asyncio.sleep_ms(0)
+
     def show_rgb565_bin(self, path, w=320, h=240):
         """Stream a raw RGB565 little-endian binary file directly to the display."""
         if w != self.width or h != self.height:
@@ -241,17 +344,23 @@ class lcd_st7789(framebuf.FrameBuffer):
 
         self._set_window(0, 0, self.width - 1, self.height - 1)
 
-        row = self._linebuf
+        # Read TX_ROWS rows per burst straight into the staging buffer; it is
+        # scratch, so it is swapped once and never swapped back.
+        row_bytes = self.width * 2
+        txv = self._txv
         self.dc(1); self.cs(0)
 
         with open(path, "rb") as f:
-            for _ in range(self.height):
-                n = f.readinto(row)
-                if n != self.width * 2:
+            left = self.height
+            while left:
+                rows = TX_ROWS if left > TX_ROWS else left
+                chunk = txv[:rows * row_bytes]
+                n = f.readinto(chunk)
+                if n != rows * row_bytes:
                     self.cs(1)
                     raise ValueError("Unexpected EOF / wrong row size: %d" % n)
-                _bswap16_inplace(row)
-                self.spi.write(row)
-                _bswap16_inplace(row)
+                _bswap16_inplace(chunk)
+                self.spi.write(chunk)
+                left -= rows
 
         self.cs(1)
@@ -0,0 +1,179 @@
+# html_portal.py - setup portal pages, kept apart from setup_server so they
+# are only loaded while the portal runs (and live in flash when frozen).
+# ASCII only, emoji as entities, so they can stay bytes literals.
+# Bodies only: setup_server sends the status line and headers (with
+# Content-Length) ahead of them.
+
+CONFIG_FORM_HTML = b"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Iris Setup</title>
+    <style>
+        :root { --primary-color: #005A9C; --light-bg: #f7f9fc; --border-color: #e0e6ed; }
+        body { font-family: sans-serif; background-color: var(--light-bg); padding: 15px; margin: 0; display: flex; justify-content: center; }
+        .form-card { max-width: 500px; width: 100%; background: #fff; padding: 25px; border-radius: 12px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); border-top: 6px solid var(--primary-color); }
+        h1 { color: var(--primary-color); font-size: 1.5em; margin-top: 0; }
+        fieldset { border: 1px solid var(--border-color); border-radius: 8px; margin-bottom: 15px; padding: 10px 15px; }
+        legend { font-weight: bold; color: var(--primary-color); padding: 0 5px; }
+        .form-group { margin-bottom: 12px; }
+        label { display: block; font-size: 0.85em; margin-bottom: 4px; font-weight: 600; }
+        input, select { width: 100%; padding: 10px; border: 1px solid var(--border-color); border-radius: 6px; box-sizing: border-box; font-size: 16px; }
+        .checkbox-group { display: flex; align-items: center; background: #f0f4f8; padding: 10px; border-radius: 6px; margin-bottom: 10px; }
+        .checkbox-group input { width: auto; margin-right: 12px; transform: scale(1.4); }
+        .checkbox-group label { margin-bottom: 0; font-size: 0.9em; cursor: pointer; }
+        .submit-btn { background: var(--primary-color); color: white; padding: 14px; border: none; border-radius: 8px; width: 100%; font-weight: bold; font-size: 1em; cursor: pointer; margin-top: 10px; }
+        .warning { background: #fff3cd; border: 1px solid #ffc107; padding: 10px; border-radius: 6px; font-size: 0.85em; color: #856404; margin-bottom: 10px; }
+        .indent { margin-left: 24px; }
+        .radio-group { margin-bottom: 10px; }
+        .radio-option { display: flex; align-items: flex-start; padding: 8px; background: #f0f4f8; border-radius: 6px; margin-bottom: 6px; }
+        .radio-option input { margin-right: 10px; margin-top: 2px; flex-shrink: 0; }
+        .radio-option label { text-align: left; }
+    </style>
+    <script>
+        function toggleCustomLow() {
+            const useThreshold = document.getElementById('use_threshold').checked;
+            const customField = document.getElementById('custom_low_field');
+            customField.style.display = useThreshold ? 'none' : 'block';
+        }
+        
+        function toggleLowValue() {
+            const enabled = document.getElementById('low_enabled').checked;
+            const radioGroup = document.getElementById('low_radio_group');
+            const customField = document.getElementById('custom_low_field');
+            const warning = document.getElementById('low_warning');
+            
+            radioGroup.style.display = enabled ? 'block' : 'none';
+            customField.style.display = 'none';
+            warning.style.display = enabled ? 'none' : 'block';
+        }
+        
+        function toggleSevereValue() {
+            const enabled = document.getElementById('severe_enabled').checked;
+            const valueField = document.getElementById('severe_value_field');
+            const warning = document.getElementById('severe_warning');
+            valueField.style.display = enabled ? 'block' : 'none';
+            warning.style.display = enabled ? 'none' : 'block';
+        }
+    </script>
+</head>
+<body>
+<div class="form-card">
+    <h1>Iris Setup Portal</h1>
+    <form action="/save" method="GET">
+        <fieldset>
+            <legend>&#x1F4E1; Wi-Fi</legend>
+            <div class="form-group"><label>SSID</label><input type="text" name="ssid" required></div>
+            <div class="form-group"><label>Password</label><input type="password" name="pwd" required></div>
+        </fieldset>
+        
+        <fieldset>
+            <legend>&#x2601;&#xFE0F; Nightscout</legend>
+            <div class="form-group"><label>URL</label><input type="url" name="ns_url" placeholder="https://..." required></div>
+            <div class="form-group"><label>API Secret</label><input type="text" name="token" required></div>
+            <div class="form-group"><label>Endpoint</label><input type="text" name="endpoint" value="/api/v1/entries/sgv.json?count=2"></div>
+        </fieldset>
+        
+        <fieldset>
+            <legend>&#x1F4CA; Display Settings</legend>
+            <div class="form-group"><label>Units</label><select name="units"><option value="mmol">mmol/L</option><option value="mgdl">mg/dL</option></select></div>
+            <div class="form-group"><label>High Threshold (Yellow)</label><input type="number" name="high" value="11.0" step="0.1"></div>
+            <div class="form-group"><label>Low Threshold (Red)</label><input type="number" name="low" value="4.0" step="0.1"></div>
+            <div class="form-group"><label>Stale Age (minutes)</label><input type="number" name="stale" value="7"></div>
+        </fieldset>
+        
+        <fieldset>
+            <legend>&#x1F514; Alert Settings (Classic/Classic Go Only.)</legend>
+            
+            <div class="checkbox-group">
+                <input type="checkbox" id="low_enabled" name="low_enabled" value="True" checked onclick="toggleLowValue()">
+                <label for="low_enabled">Enable Low Alert (3 beeps)</label>
+            </div>
+            
+            <div class="warning" id="low_warning" style="display:none;">
+                &#x26A0;&#xFE0F; <strong>Warning:</strong> Disabling low alerts is not recommended for safety reasons.
+            </div>
+            
+            <div class="radio-group indent" id="low_radio_group">
+                <div class="radio-option">
+                    <input type="radio" id="use_threshold" name="low_mode" value="threshold" checked onclick="toggleCustomLow()">
+                    <label for="use_threshold">Use Low Threshold (same as color)</label>
+                </div>
+                <div class="radio-option">
+                    <input type="radio" id="use_custom" name="low_mode" value="custom" onclick="toggleCustomLow()">
+                    <label for="use_custom">Use Custom Alert Value</label>
+                </div>
+            </div>
+            
+            <div class="form-group indent" id="custom_low_field" style="display:none;">
+                <label>Custom Low Alert Value</label>
+                <input type="number" name="low_custom" value="4.0" step="0.1">
+            </div>
+            
+            <div class="checkbox-group">
+                <input type="checkbox" id="severe_enabled" name="severe_enabled" value="True" checked onclick="toggleSevereValue()">
+                <label for="severe_enabled">Enable Severe Low Alert (constant tone)</label>
+            </div>
+            
+            <div class="warning" id="severe_warning" style="display:none;">
+                &#x26A0;&#xFE0F; <strong>Warning:</strong> Disabling severe alerts is not recommended for safety reasons.
+            </div>
+            
+            <div class="form-group indent" id="severe_value_field">
+                <label>Severe Low Threshold</label>
+                <input type="number" name="severe" value="3.0" step="0.1">
+            </div>
+            
+            <div class="form-group">
+                <label>Snooze Duration (minutes)</label>
+                <input type="number" name="snooze" value="10" min="1" max="60">
+            </div>
+        </fieldset>
+        
+        <fieldset>
+            <legend>&#x1F4C8; Trend Alerts</legend>
+            <div class="checkbox-group">
+                <input type="checkbox" id="up" name="alert_up" value="True" checked>
+                <label for="up">Yellow Arrow on Double Up</label>
+            </div>
+            <div class="checkbox-group">
+                <input type="checkbox" id="down" name="alert_down" value="True" checked>
+                <label for="down">Red Arrow on Double Down</label>
+            </div>
+        </fieldset>
+        
+        <button type="submit" class="submit-btn">Save & Reboot</button>
+    </form>
+</div>
+</body>
+</html>
+"""
+
+CONFIG_SAVED_HTML = b"""<html>
+<head>
+    <meta charset="UTF-8">
+</head>
+<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; text-align:center; padding-top:100px; background-color:#f0f2f5; margin:0;">
+    <div style="background:white; padding:40px; border-radius:16px; display:inline-block; box-shadow:0 10px 25px rgba(0,0,0,0.05); max-width: 320px; width: 90%;">
+        
+        <div style="width:60px; height:60px; background:#e8f5e9; color:#2e7d32; border-radius:50%; line-height:60px; font-size:30px; margin: 0 auto 20px auto;">
+            &#10004;
+        </div>
+
+        <h1 style="color:#111827; margin:0 0 10px 0; font-size: 24px;">Success!</h1>
+        
+        <div style="height:2px; background:#e5e7eb; width:100%; margin: 20px 0;"></div>
+        
+        <p style="color:#4b5563; font-size:16px; line-height:1.5; margin:0 0 12px 0;">
+            Your Iris Mini is now syncing your data and connecting to your network.
+        </p>
+        
+        <p style="color:#1A936F; font-weight:600; font-size:15px; margin:0;">
+            You may now close this window.
+        </p>
+
+    </div>
+</body>
+</html>
+"""
@@ -0,0 +1,35 @@
+# manifest.py - frozen modules for a custom Iris Mini firmware build
+#
+# Build (from the MicroPython esp32 port directory):
+#   make BOARD=ESP32_GENERIC_S3 BOARD_VARIANT=SPIRAM_OCT \
+#        FROZEN_MANIFEST=/path/to/Iris-Mini/manifest.py
+#
+# Frozen bytecode runs from flash instead of being compiled onto the heap at
+# every boot. The filesystem comes first on sys.path, so a .py copy left on
+# the device (e.g. one delivered by an OTA update) still overrides the frozen
+# module; delete it from the device to use the frozen one.
+
+include("$(PORT_DIR)/boards/manifest.py")
+
+# Display driver + text renderer
+freeze(".", ("display_2inch.py", "writer.py"))
+
+# Fonts (large constant tables)
+freeze(".", (
+    "small_font.py",
+    "age_small_font.py",
+    "large_font.py",
+    "arrows_font.py",
+    "heart.py",
+    "delta.py",
+    "config_font.py",
+    "config_font_title.py",
+))
+
+# Application modules. config.py is deliberately not frozen: the setup portal
+# writes it on the device, and a factory reset deletes it.
+freeze(".", ("app_main.py", "control_poll.py"))
+
+# Setup portal: server and pages frozen, their bytes stay in flash instead of
+# the heap while the portal runs
+freeze(".", ("setup_server.py", "html_portal.py"))
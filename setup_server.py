@@ -26,214 +26,100 @@ def log(msg):
     print("[{:>8}ms] SETUP: {}".format(timestamp, msg))
 
 def url_decode(s):
-    # Convert + to space and decode %xx hex values
+    # Convert + to space and decode %xx hex values. Bytes are collected in one
+    # bytearray and decoded once, so multi-byte UTF-8 escapes come out right.
     s = s.replace('+', ' ')
-    parts = s.split('%')
-    res = parts[0]
-    for part in parts[1:]:
-        try:
-            res += chr(int(part[:2], 16)) + part[2:]
-        except:
-            res += '%' + part
-    return res.strip()
+    j = s.find('%')
+    if j < 0:
+        return s.strip()  # nothing escaped (the common case): no byte builder
+    out = bytearray()
+    i = 0
+    n = len(s)
+    while j >= 0:
+        out.extend(s[i:j].encode())
+        i = j + 1
+        if j + 3 <= n:
+            try:
+                out.append(int(s[j + 1:j + 3], 16))
+                i = j + 3
+            except ValueError:
+                out.append(0x25)  # literal '%'
+        else:
+            out.append(0x25)
+        j = s.find('%', i)
+    out.extend(s[i:].encode())
+    return out.decode('utf-8', 'ignore').strip()
 
 def parse_params(path):
     params = {}
     try:
-        if '?' in path:
-            query = path.split('?')[1].split(' ')[0]
-            pairs = query.split('&')
-            for pair in pairs:
-                if '=' in pair:
-                    key, val = pair.split('=')
-                    params[key] = url_decode(val)
+        # Walk the query by offsets rather than split() into pair lists
+        i = path.find('?') + 1
+        if i:
+            n = path.find(' ', i)
+            if n < 0:
+                n = len(path)
+            while i < n:
+                j = path.find('&', i, n)
+                if j < 0:
+                    j = n
+                eq = path.find('=', i, j)
+                if eq >= 0:
+                    params[path[i:eq]] = url_decode(path[eq + 1:j])
+                i = j + 1
     except Exception as e:
         log("Parse Error: {}".format(e))
     return params
 
-# --- HTML Templates ---
-CONFIG_FORM_HTML = """HTTP/1.1 200 OK
-Content-Type: text/html
+# config.py written on save; filled with one % so the file goes out in a single write
+CONFIG_PY_TEMPLATE = """# WiFi Configuration
+WIFI_SSID = '%s'
+WIFI_PASSWORD = '%s'
 
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Iris Setup</title>
-    <style>
-        :root { --primary-color: #005A9C; --light-bg: #f7f9fc; --border-color: #e0e6ed; }
-        body { font-family: sans-serif; background-color: var(--light-bg); padding: 15px; margin: 0; display: flex; justify-content: center; }
-        .form-card { max-width: 500px; width: 100%; background: #fff; padding: 25px; border-radius: 12px; box-shadow: 0 4px 15px rgba(0,0,0,0.1); border-top: 6px solid var(--primary-color); }
-        h1 { color: var(--primary-color); font-size: 1.5em; margin-top: 0; }
-        fieldset { border: 1px solid var(--border-color); border-radius: 8px; margin-bottom: 15px; padding: 10px 15px; }
-        legend { font-weight: bold; color: var(--primary-color); padding: 0 5px; }
-        .form-group { margin-bottom: 12px; }
-        label { display: block; font-size: 0.85em; margin-bottom: 4px; font-weight: 600; }
-        input, select { width: 100%; padding: 10px; border: 1px solid var(--border-color); border-radius: 6px; box-sizing: border-box; font-size: 16px; }
-        .checkbox-group { display: flex; align-items: center; background: #f0f4f8; padding: 10px; border-radius: 6px; margin-bottom: 10px; }
-        .checkbox-group input { width: auto; margin-right: 12px; transform: scale(1.4); }
-        .checkbox-group label { margin-bottom: 0; font-size: 0.9em; cursor: pointer; }
-        .submit-btn { background: var(--primary-color); color: white; padding: 14px; border: none; border-radius: 8px; width: 100%; font-weight: bold; font-size: 1em; cursor: pointer; margin-top: 10px; }
-        .warning { background: #fff3cd; border: 1px solid #ffc107; padding: 10px; border-radius: 6px; font-size: 0.85em; color: #856404; margin-bottom: 10px; }
-        .indent { margin-left: 24px; }
-        .radio-group { margin-bottom: 10px; }
-        .radio-option { display: flex; align-items: flex-start; padding: 8px; background: #f0f4f8; border-radius: 6px; margin-bottom: 6px; }
-        .radio-option input { margin-right: 10px; margin-top: 2px; flex-shrink: 0; }
-        .radio-option label { text-align: left; }
-    </style>
-    <script>
-        function toggleCustomLow() {
-            const useThreshold = document.getElementById('use_threshold').checked;
-            const customField = document.getElementById('custom_low_field');
-            customField.style.display = useThreshold ? 'none' : 'block';
-        }
-        
-        function toggleLowValue() {
-            const enabled = document.getElementById('low_enabled').checked;
-            const radioGroup = document.getElementById('low_radio_group');
-            const customField = document.getElementById('custom_low_field');
-            const warning = document.getElementById('low_warning');
-            
-            radioGroup.style.display = enabled ? 'block' : 'none';
-            customField.style.display = 'none';
-            warning.style.display = enabled ? 'none' : 'block';
-        }
-        
-        function toggleSevereValue() {
-            const enabled = document.getElementById('severe_enabled').checked;
-            const valueField = document.getElementById('severe_value_field');
-            const warning = document.getElementById('severe_warning');
-            valueField.style.display = enabled ? 'block' : 'none';
-            warning.style.display = enabled ? 'none' : 'block';
-        }
-    </script>
-</head>
-<body>
-<div class="form-card">
-    <h1>Iris Setup Portal</h1>
-    <form action="/save" method="GET">
-        <fieldset>
-            <legend>📡 Wi-Fi</legend>
-            <div class="form-group"><label>SSID</label><input type="text" name="ssid" required></div>
-            <div class="form-group"><label>Password</label><input type="password" name="pwd" required></div>
-        </fieldset>
-        
-        <fieldset>
-            <legend>☁️ Nightscout</legend>
-            <div class="form-group"><label>URL</label><input type="url" name="ns_url" placeholder="https://..." required></div>
-            <div class="form-group"><label>API Secret</label><input type="text" name="token" required></div>
-            <div class="form-group"><label>Endpoint</label><input type="text" name="endpoint" value="/api/v1/entries/sgv.json?count=2"></div>
-        </fieldset>
-        
-        <fieldset>
-            <legend>📊 Display Settings</legend>
-            <div class="form-group"><label>Units</label><select name="units"><option value="mmol">mmol/L</option><option value="mgdl">mg/dL</option></select></div>
-            <div class="form-group"><label>High Threshold (Yellow)</label><input type="number" name="high" value="11.0" step="0.1"></div>
-            <div class="form-group"><label>Low Threshold (Red)</label><input type="number" name="low" value="4.0" step="0.1"></div>
-            <div class="form-group"><label>Stale Age (minutes)</label><input type="number" name="stale" value="7"></div>
-        </fieldset>
-        
-        <fieldset>
-            <legend>🔔 Alert Settings (Classic/Classic Go Only.)</legend>
-            
-            <div class="checkbox-group">
-                <input type="checkbox" id="low_enabled" name="low_enabled" value="True" checked onclick="toggleLowValue()">
-                <label for="low_enabled">Enable Low Alert (3 beeps)</label>
-            </div>
-            
-            <div class="warning" id="low_warning" style="display:none;">
-                ⚠️ <strong>Warning:</strong> Disabling low alerts is not recommended for safety reasons.
-            </div>
-            
-            <div class="radio-group indent" id="low_radio_group">
-                <div class="radio-option">
-                    <input type="radio" id="use_threshold" name="low_mode" value="threshold" checked onclick="toggleCustomLow()">
-                    <label for="use_threshold">Use Low Threshold (same as color)</label>
-                </div>
-                <div class="radio-option">
-                    <input type="radio" id="use_custom" name="low_mode" value="custom" onclick="toggleCustomLow()">
-                    <label for="use_custom">Use Custom Alert Value</label>
-                </div>
-            </div>
-            
-            <div class="form-group indent" id="custom_low_field" style="display:none;">
-                <label>Custom Low Alert Value</label>
-                <input type="number" name="low_custom" value="4.0" step="0.1">
-            </div>
-            
-            <div class="checkbox-group">
-                <input type="checkbox" id="severe_enabled" name="severe_enabled" value="True" checked onclick="toggleSevereValue()">
-                <label for="severe_enabled">Enable Severe Low Alert (constant tone)</label>
-            </div>
-            
-            <div class="warning" id="severe_warning" style="display:none;">
-                ⚠️ <strong>Warning:</strong> Disabling severe alerts is not recommended for safety reasons.
-            </div>
-            
-            <div class="form-group indent" id="severe_value_field">
-                <label>Severe Low Threshold</label>
-                <input type="number" name="severe" value="3.0" step="0.1">
-            </div>
-            
-            <div class="form-group">
-                <label>Snooze Duration (minutes)</label>
-                <input type="number" name="snooze" value="10" min="1" max="60">
-            </div>
-        </fieldset>
-        
-        <fieldset>
-            <legend>📈 Trend Alerts</legend>
-            <div class="checkbox-group">
-                <input type="checkbox" id="up" name="alert_up" value="True" checked>
-                <label for="up">Yellow Arrow on Double Up</label>
-            </div>
-            <div class="checkbox-group">
-                <input type="checkbox" id="down" name="alert_down" value="True" checked>
-                <label for="down">Red Arrow on Double Down</label>
-            </div>
-        </fieldset>
-        
-        <button type="submit" class="submit-btn">Save & Reboot</button>
-    </form>
-</div>
-</body>
-</html>
-"""
+# Nightscout Configuration
+NS_URL = '%s'
+API_SECRET = '%s'
+API_ENDPOINT = '%s'
+
+# Display Units
+UNITS = '%s'
+
+# Color Thresholds
+THRESHOLD_LOW = %s
+THRESHOLD_HIGH = %s
 
-CONFIG_SAVED_HTML = """HTTP/1.1 200 OK
-Content-Type: text/html
+# Alert Thresholds
+ALERT_LOW_ENABLED = %s
+ALERT_LOW_USE_THRESHOLD = %s
+ALERT_LOW_CUSTOM = %s
+ALERT_SEVERE_ENABLED = %s
+ALERT_SEVERE_THRESHOLD = %s
 
-<html>
-<head>
-    <meta charset="UTF-8">
-</head>
-<body style="font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Helvetica, Arial, sans-serif; text-align:center; padding-top:100px; background-color:#f0f2f5; margin:0;">
-    <div style="background:white; padding:40px; border-radius:16px; display:inline-block; box-shadow:0 10px 25px rgba(0,0,0,0.05); max-width: 320px; width: 90%;">
-        
-        <div style="width:60px; height:60px; background:#e8f5e9; color:#2e7d32; border-radius:50%; line-height:60px; font-size:30px; margin: 0 auto 20px auto;">
-            &#10004;
-        </div>
+# Alert Snooze Duration
+ALERT_SNOOZE_MINUTES = %s
 
-        <h1 style="color:#111827; margin:0 0 10px 0; font-size: 24px;">Success!</h1>
-        
-        <div style="height:2px; background:#e5e7eb; width:100%; margin: 20px 0;"></div>
-        
-        <p style="color:#4b5563; font-size:16px; line-height:1.5; margin:0 0 12px 0;">
-            Your Iris Mini is now syncing your data and connecting to your network.
-        </p>
-        
-        <p style="color:#1A936F; font-weight:600; font-size:15px; margin:0;">
-            You may now close this window.
-        </p>
+# Trend-Based Alerts
+ALERT_DOUBLE_UP = %s
+ALERT_DOUBLE_DOWN = %s
 
-    </div>
-</body>
-</html>
+# Data Staleness
+STALE_MINS = %s
 """
 
 # --- Server Logic ---
+def _html_head(body):
+    return ("HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+            "Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body)).encode()
+
 def run():
+    # Page bytes live in their own (freezable) module; only needed from here
+    from html_portal import CONFIG_FORM_HTML, CONFIG_SAVED_HTML
+
+    # Headers built once; Content-Length lets the browser finish without
+    # waiting on the close, and the page bytes are sent as-is after them
+    form_head = _html_head(CONFIG_FORM_HTML)
+    saved_head = _html_head(CONFIG_SAVED_HTML)
+
     # Clear radio state
     sta = network.WLAN(network.STA_IF)
     ap = network.WLAN(network.AP_IF)
@@ -267,16 +153,23 @@ def run():
         cl = None
         try:
             cl, addr = s.accept()
-            request = cl.recv(2048).decode('utf-8')
+            request = cl.recv(2048)
             if not request:
                 cl.close()
                 continue
-            
-            path = request.split(' ')[1]
+
+            # Only the request target matters ("GET <target> HTTP/1.1");
+            # decode just that, not the method, version or headers
+            sp = request.find(b' ')
+            end = request.find(b' ', sp + 1)
+            if sp < 0 or end < 0:
+                cl.close()
+                continue
+            path = request[sp + 1:end].decode('utf-8')
 
             # 1. Kill Favicon requests to save memory
             if path == '/favicon.ico':
-                cl.send("HTTP/1.1 404 Not Found\r\n\r\n")
+                cl.sendall(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
                 cl.close()
                 continue
 
@@ -294,34 +187,40 @@ def run():
                 low_mode = params.get('low_mode', 'threshold')
                 use_threshold = "True" if low_mode == 'threshold' else "False"
                 
-                with open("config.py", "w") as f:
-                    f.write("# WiFi Configuration\n")
-                    f.write("WIFI_SSID = '{}'\n".format(params.get('ssid', '')))
-                    f.write("WIFI_PASSWORD = '{}'\n".format(params.get('pwd', '')))
-                    f.write("\n# Nightscout Configuration\n")
-                    f.write("NS_URL = '{}'\n".format(params.get('ns_url', '').rstrip('/')))
-                    f.write("API_SECRET = '{}'\n".format(params.get('token', '')))
-                    f.write("API_ENDPOINT = '{}'\n".format(params.get('endpoint', '')))
-                    f.write("\n# Display Units\n")
-                    f.write("UNITS = '{}'\n".format(params.get('units', 'mmol')))
-                    f.write("\n# Color Thresholds\n")
-                    f.write("THRESHOLD_LOW = {}\n".format(params.get('low', '4.0')))
-                    f.write("THRESHOLD_HIGH = {}\n".format(params.get('high', '11.0')))
-                    f.write("\n# Alert Thresholds\n")
-                    f.write("ALERT_LOW_ENABLED = {}\n".format(low_enabled))
-                    f.write("ALERT_LOW_USE_THRESHOLD = {}\n".format(use_threshold))
-                    f.write("ALERT_LOW_CUSTOM = {}\n".format(params.get('low_custom', '4.0')))
-                    f.write("ALERT_SEVERE_ENABLED = {}\n".format(severe_enabled))
-                    f.write("ALERT_SEVERE_THRESHOLD = {}\n".format(params.get('severe', '3.0')))
-                    f.write("\n# Alert Snooze Duration\n")
-                    f.write("ALERT_SNOOZE_MINUTES = {}\n".format(params.get('snooze', '10')))
-                    f.write("\n# Trend-Based Alerts\n")
-                    f.write("ALERT_DOUBLE_UP = {}\n".format(up))
-                    f.write("ALERT_DOUBLE_DOWN = {}\n".format(dn))
-                    f.write("\n# Data Staleness\n")
-                    f.write("STALE_MINS = {}\n".format(params.get('stale', '7')))
+                # Write aside and rename over, so a power cut mid-save never
+                # leaves a truncated config.py (LittleFS rename is atomic)
+                with open("config.py.new", "w") as f:
+                    f.write(CONFIG_PY_TEMPLATE % (
+                        params.get('ssid', ''),
+                        params.get('pwd', ''),
+                        params.get('ns_url', '').rstrip('/'),
+                        params.get('token', ''),
+                        params.get('endpoint', ''),
+                        params.get('units', 'mmol'),
+                        params.get('low', '4.0'),
+                        params.get('high', '11.0'),
+                        low_enabled,
+                        use_threshold,
+                        params.get('low_custom', '4.0'),
+                        severe_enabled,
+                        params.get('severe', '3.0'),
+                        params.get('snooze', '10'),
+                        up,
+                        dn,
+                        params.get('stale', '7'),
+                    ))
+                try:
+                    os.rename("config.py.new", "config.py")
+                except OSError:
+                    # FAT won't rename over an existing file; drop it first
+                    try:
+                        os.remove("config.py")
+                    except OSError:
+                        pass
+                    os.rename("config.py.new", "config.py")
                 
-                cl.send(CONFIG_SAVED_HTML)
+                cl.sendall(saved_head)
+                cl.sendall(CONFIG_SAVED_HTML)
                 cl.close()
                 
                 # Hard Reset via Watchdog
@@ -333,7 +232,8 @@ def run():
             
             # 3. Serve Form
             else:
-                cl.send(CONFIG_FORM_HTML)
+                cl.sendall(form_head)
+                cl.sendall(CONFIG_FORM_HTML)
                 cl.close()
                 
         except Exception as e:
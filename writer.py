@@ -1,4 +1,5 @@
 import framebuf
+import micropython
 from uctypes import bytearray_at, addressof
 
 __version__ = (0, 5, 2)
@@ -14,6 +15,32 @@ def _get_id(device):
     return id(device)
 
 
+# Render one MONO_HLSB glyph straight into an RGB565 framebuffer, clipped to
+# the device. Replaces a device.pixel() call per glyph pixel.
+@micropython.viper
+def _blit_glyph(dst, dst_w: int, dst_h: int, glyph, x: int, y: int,
+                w: int, h: int, fg: int, bg: int):
+    d = ptr16(dst)
+    g = ptr8(glyph)
+    bpr = (w + 7) >> 3
+    row = 0
+    while row < h:
+        yy = y + row
+        if yy >= 0 and yy < dst_h:
+            base = yy * dst_w
+            gi = row * bpr
+            col = 0
+            while col < w:
+                xx = x + col
+                if xx >= 0 and xx < dst_w:
+                    if (g[gi + (col >> 3)] >> (7 - (col & 7))) & 1:
+                        d[base + xx] = fg
+                    else:
+                        d[base + xx] = bg
+                col += 1
+        row += 1
+
+
 # Basic Writer class for monochrome displays
 class Writer:
 
@@ -102,6 +129,11 @@ class Writer:
         return self.font.height()
 
     def printstring(self, string, invert=False):
+        # Single-line fast path: no split() list for the common case
+        if "\n" not in string:
+            if string:
+                self._printline(string, invert)
+            return
         # word wrapping. Assumes words separated by single space.
         q = string.split("\n")
         last = len(q) - 1
@@ -138,9 +170,11 @@ class Writer:
             return 0
         sc = self._getstate().text_col  # Start column
         wd = self.screenwidth
+        get_ch = self.font.get_ch
         l = 0
-        for char in string[:-1]:
-            _, _, char_width = self.font.get_ch(char)
+        # Index rather than slice: string[:-1] allocated a copy per call
+        for i in range(len(string) - 1):
+            _, _, char_width = get_ch(string[i])
             l += char_width
             if self.char_spacing:
                 l += self.char_spacing
@@ -148,7 +182,7 @@ class Writer:
             if oh and l + sc > wd:
                 return True  # All done. Save time.
         char = string[-1]
-        _, _, char_width = self.font.get_ch(char)
+        _, _, char_width = get_ch(char)
         if oh and l + sc + char_width > wd:
             l += self._truelen(char)  # Last char might have blank cols on RHS
         else:
@@ -299,17 +333,25 @@ class CWriter(Writer):
         glyph = self.glyph
         char_height = self.char_height
         char_width = self.char_width
-        bytes_per_row = (char_width + 7) // 8
+        dev = self.device
 
-        # Draw the character pixel by pixel
-        for row in range(char_height):
-            for col in range(char_width):
-                byte_idx = (row * bytes_per_row) + (col // 8)
-                bit_idx = 7 - (col % 8)
-                if (glyph[byte_idx] >> bit_idx) & 1:
-                    self.device.pixel(s.text_col + col, s.text_row + row, fg)
-                else:
-                    self.device.pixel(s.text_col + col, s.text_row + row, bg)
+        buf = getattr(dev, "buffer", None)
+        if buf is not None:
+            # Write RGB565 words directly into the device framebuffer
+            _blit_glyph(buf, dev.width, dev.height, glyph,
+                        s.text_col, s.text_row, char_width, char_height, fg, bg)
+        else:
+            bytes_per_row = (char_width + 7) // 8
+
+            # Draw the character pixel by pixel
+            for row in range(char_height):
+                for col in range(char_width):
+                    byte_idx = (row * bytes_per_row) + (col // 8)
+                    bit_idx = 7 - (col % 8)
+                    if (glyph[byte_idx] >> bit_idx) & 1:
+                        dev.pixel(s.text_col + col, s.text_row + row, fg)
+                    else:
+                        dev.pixel(s.text_col + col, s.text_row + row, bg)
 
         s.text_col += char_width
         self.cpos += 1